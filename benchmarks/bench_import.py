@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Import-time benchmark for the downloadhelper package and its CLI fast path.
+
+Each case runs in a fresh interpreter. Besides the median wall time, the
+benchmark fails if a case pulls in one of the heavy modules it should avoid,
+so regressions in the lazy imports show up in CI or cron logs.
+
+    python benchmarks/bench_import.py [--repeat N] [--max-ms MS]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("huggingface_hub", "requests", "tqdm", "PyQt5")
+
+# Each case imports/runs something and then prints the heavy modules it loaded
+CASES = {
+    "import downloadhelper": "import downloadhelper",
+    "cli --help": (
+        "from downloadhelper.__main__ import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass"
+    ),
+    "cli status": "from downloadhelper.__main__ import main; main(['status', '--save-path', '.'])",
+}
+
+REPORT = (
+    "\nimport sys as _sys\n"
+    f"print('HEAVY=' + ','.join(m for m in {HEAVY_MODULES!r} if m in _sys.modules))"
+)
+
+def run_case(code):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code + REPORT], cwd=ROOT,
+                            capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    heavy = [line[len("HEAVY="):] for line in result.stdout.splitlines() if line.startswith("HEAVY=")]
+    return elapsed, heavy[-1] if heavy else ""
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark downloadhelper import time")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per case")
+    parser.add_argument("--max-ms", type=float, help="Fail if a case's median exceeds this")
+    args = parser.parse_args()
+
+    baseline = statistics.median(run_case("pass")[0] for _ in range(args.repeat))
+    print(f"{'python startup':<24}{baseline:8.1f} ms")
+
+    failed = False
+    for name, code in CASES.items():
+        timings = []
+        heavy = ""
+        for _ in range(args.repeat):
+            elapsed, heavy = run_case(code)
+            timings.append(elapsed)
+        median = statistics.median(timings)
+        line = f"{name:<24}{median:8.1f} ms  (+{median - baseline:.1f} ms)"
+        if heavy:
+            line += f"  loaded heavy modules: {heavy}"
+            failed = True
+        if args.max_ms is not None and median > args.max_ms:
+            line += "  over budget"
+            failed = True
+        print(line)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
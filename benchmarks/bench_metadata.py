@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark for resolving the metadata of many repos at once.
+
+Compares fetch_many() on one worker (the old serial behaviour) with the
+default pool. Without --live the Hub request is replaced by a sleep of
+--latency-ms, so the numbers only depend on the scheduling; with --live
+the given repos are fetched from the Hub (needs huggingface_hub and network).
+
+    python benchmarks/bench_metadata.py [--repos N] [--latency-ms MS] [--workers N]
+    python benchmarks/bench_metadata.py --live org/model1 org/model2 ...
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from downloadhelper import metadata
+from downloadhelper.metadata import DEFAULT_FETCH_WORKERS, fetch_many, metadata_cache
+
+def simulated_fetch(latency):
+    def fetch_repo_metadata(repo_id, revision=None, token=None):
+        time.sleep(latency)
+        files = {"model.safetensors": {'size': 1, 'sha256': None}}
+        metadata_cache.put(repo_id, revision, files)
+        return files
+    return fetch_repo_metadata
+
+def timed(repo_ids, workers):
+    metadata_cache.invalidate()
+    start = time.perf_counter()
+    results, errors = fetch_many(repo_ids, max_workers=workers)
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, len(results), len(errors)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent repo metadata fetches")
+    parser.add_argument("--repos", type=int, default=20, help="Number of simulated repos")
+    parser.add_argument("--latency-ms", type=float, default=150, help="Simulated time per Hub request")
+    parser.add_argument("--workers", type=int, default=DEFAULT_FETCH_WORKERS, help="Pool size for the concurrent run")
+    parser.add_argument("--live", nargs="+", metavar="REPO_ID", help="Fetch these repos from the Hub instead")
+    args = parser.parse_args()
+
+    if args.live:
+        repo_ids = args.live
+    else:
+        repo_ids = [f"bench/model-{i}" for i in range(args.repos)]
+        metadata.fetch_repo_metadata = simulated_fetch(args.latency_ms / 1000)
+
+    for name, workers in (("serial", 1), (f"{args.workers} workers", args.workers)):
+        elapsed, ok, failed = timed(repo_ids, workers)
+        line = f"{name:<16}{elapsed:9.1f} ms  {ok} repos"
+        if failed:
+            line += f", {failed} failed"
+        print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -64,11 +64,8 @@ if "%MODEL_ID%"=="" (
     goto :eof
 )
 
-:: Add the --no-auto-next flag to the Python command if needed
-set AUTO_NEXT_FLAG=
-if "%NO_AUTO_NEXT%"=="true" set AUTO_NEXT_FLAG=--no-auto-next
-
-:: Call Python script with processed arguments
-python -m downloadhelper %MODEL_ID% %AUTO_NEXT_FLAG% %*
+:: Call Python script with the original arguments (%* already contains
+:: the model ID and --no-auto-next, and quick commands like status/list/verify)
+python -m downloadhelper %*
 
 endlocal
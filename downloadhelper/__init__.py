@@ -0,0 +1,30 @@
+"""Huggingface Downloadhelper
+
+Heavy dependencies (huggingface_hub, requests, PyQt5) are only imported when
+the objects that need them are first used, so importing the package and the
+status/list/verify commands stay fast.
+"""
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    'HuggingfaceDownloader': 'core',
+    'DownloadManager': 'core',
+    'download_manager': 'core',
+    'DownloadScheduler': 'scheduler',
+    'DiskWriterPool': 'diskwriter',
+    'metadata_cache': 'metadata',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
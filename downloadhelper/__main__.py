@@ -0,0 +1,124 @@
+import argparse
+import sys
+from .metadata import DEFAULT_FETCH_WORKERS
+from .planner import parse_size
+
+# Commands served by the stdlib-only fast path (no huggingface_hub/requests)
+FAST_COMMANDS = ('status', 'list', 'verify')
+
+DEFAULT_SEARCH_LIMIT = 100  # Repos returned by --author/--search
+SEARCH_CONFIRM_COUNT = 10  # Downloading more search matches than this needs --yes
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="downloadhelper",
+        description="Download models from Huggingface Hub",
+        epilog="Quick commands: status, list MODEL_ID, verify MODEL_ID (see `<command> --help`)"
+    )
+    parser.add_argument("model_id", nargs="*", help="Huggingface model ID(s) to download")
+    parser.add_argument("--author", help="Also download every model of this user or organization")
+    parser.add_argument("--search", help="Also download every model whose name matches this search")
+    parser.add_argument("--limit", type=int, default=DEFAULT_SEARCH_LIMIT,
+                        help=f"Max number of repos taken from --author/--search (default {DEFAULT_SEARCH_LIMIT})")
+    parser.add_argument("--yes", action="store_true",
+                        help=f"Download more than {SEARCH_CONFIRM_COUNT} search matches without asking for --dry-run first")
+    parser.add_argument("--dry-run", action="store_true", help="Only resolve the repos and print the disk plan")
+    parser.add_argument("--metadata-workers", type=int, default=DEFAULT_FETCH_WORKERS,
+                        help="Number of repos whose metadata is fetched at once")
+    parser.add_argument("--save-path", default="./models", help="Directory to save the model")
+    parser.add_argument("--no-auth", action="store_true", help="Disable authentication")
+    parser.add_argument("--token", help="Huggingface token")
+    parser.add_argument("--revision", help="Branch or commit to download from")
+    parser.add_argument("--files", help="Comma-separated list of files to download")
+    parser.add_argument("--no-resume", action="store_true", help="Don't resume interrupted downloads")
+    parser.add_argument("--no-auto-next", action="store_true", help="Don't automatically queue next part")
+    parser.add_argument("--policy", default="priority", choices=["priority", "sjf", "fifo"],
+                        help="Order in which files are downloaded")
+    parser.add_argument("--max-workers", type=int, default=1, help="Number of files to download at once")
+    parser.add_argument("--boost", help="Comma-separated list of model IDs that are needed now")
+    parser.add_argument("--progress-interval", type=float, default=10,
+                        help="Seconds between overall speed/ETA lines (0 to disable)")
+    parser.add_argument("--quota", type=parse_size, help="Max size of the save directory, e.g. 200G")
+    parser.add_argument("--evict-dir", action="append", default=[],
+                        help="Directory whose least recently used subfolders may be deleted to make room")
+    parser.add_argument("--evict-cache", action="store_true",
+                        help="Allow deleting least recently used Hugging Face cache entries to make room")
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv and argv[0] in FAST_COMMANDS:
+        from .fastpath import main as fast_main
+        return fast_main(argv)
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.model_id and not (args.author or args.search):
+        parser.error("a model ID, --author or --search is required")
+
+    from .core import HuggingfaceDownloader
+
+    # Convert comma-separated files to list
+    filenames = args.files.split(",") if args.files else None
+
+    # Create downloader
+    downloader = HuggingfaceDownloader(
+        save_path=args.save_path,
+        use_auth=not args.no_auth,
+        token=args.token,
+        no_auto_next=args.no_auto_next,
+        policy=args.policy,
+        max_workers=args.max_workers,
+        progress_interval=args.progress_interval,
+        quota=args.quota,
+        evict_dirs=args.evict_dir,
+        evict_cache=args.evict_cache,
+        metadata_workers=args.metadata_workers
+    )
+
+    for model_id in (args.boost.split(",") if args.boost else []):
+        downloader.scheduler.boost(model_id)
+
+    model_ids = list(args.model_id)
+    if args.author or args.search:
+        from .metadata import search_repos
+        matches = search_repos(author=args.author, search=args.search,
+                               token=None if args.no_auth else downloader.token, limit=args.limit)
+        if not matches:
+            print("No models matched the search.")
+            return 1
+        if len(matches) >= args.limit:
+            print(f"The search was cut off at {args.limit} repos (--limit).")
+        if len(matches) > SEARCH_CONFIRM_COUNT and not (args.dry_run or args.yes):
+            # A broad search can match thousands of repos, don't start them all unasked
+            for model_id in matches:
+                print(f"  {model_id}")
+            print(f"{len(matches)} repos matched. Check them with --dry-run, then download with --yes.")
+            return 1
+        model_ids += matches
+
+    # Start download, ignoring repeated model IDs
+    model_ids = list(dict.fromkeys(model_ids))
+    if args.dry_run:
+        downloader.plan_multiple(model_ids, revision=args.revision)
+    elif len(model_ids) == 1:
+        # A search keeps the per-repo layout even if it matched a single repo today
+        downloader.download(
+            model_id=model_ids[0],
+            revision=args.revision,
+            filenames=filenames,
+            resume=not args.no_resume,
+            separate_dir=True if args.author or args.search else None
+        )
+    else:
+        downloader.download_multiple(
+            model_ids,
+            max_workers=max(2, args.max_workers),
+            revision=args.revision,
+            resume=not args.no_resume
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
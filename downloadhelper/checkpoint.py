@@ -0,0 +1,98 @@
+import json
+import os
+
+# Durable download state. Each unfinished file has a "<file>.partial.json"
+# checkpoint with the byte offset known to be on disk, and the output directory
+# has a session file listing the queued files and whether they were paused, so
+# both survive closing the app. When several repos are downloaded together each
+# gets its own subdirectory, marked with the repo ID so `status` can find it.
+# Only the standard library is used here.
+
+PARTIAL_SUFFIX = ".partial"
+CHECKPOINT_SUFFIX = ".partial.json"
+SESSION_FILENAME = ".downloadhelper-session.json"
+REPO_MARKER = ".downloadhelper-repo.json"
+TEMP_SUFFIX = ".tmp"
+
+def _write_json(path, data):
+    # Write to a temp file and rename so a crash never leaves half a file behind
+    temp_path = path + TEMP_SUFFIX
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def save_checkpoint(output_path, repo_id, offset, size=0, etag=None):
+    """Record offset bytes of output_path as durable; the caller fsyncs the partial file first"""
+    _write_json(output_path + CHECKPOINT_SUFFIX,
+                {'repo_id': repo_id, 'offset': offset, 'size': size, 'etag': etag})
+
+def load_checkpoint(output_path):
+    return _read_json(output_path + CHECKPOINT_SUFFIX)
+
+def clear_checkpoint(output_path):
+    _remove(output_path + CHECKPOINT_SUFFIX)
+
+def resume_point(output_path, repo_id):
+    """(offset, etag) to resume output_path from, trimming the partial file to the checkpoint.
+
+    Bytes past the checkpoint may have been written out of order by the
+    write-behind pool, so they are dropped and downloaded again. Without an
+    ETag to send as If-Range the bytes on disk can't be matched to the
+    remote file, so such checkpoints resume from 0.
+    """
+    partial_path = output_path + PARTIAL_SUFFIX
+    checkpoint = load_checkpoint(output_path)
+    if (not checkpoint or checkpoint.get('repo_id') != repo_id or not checkpoint.get('etag')
+            or not os.path.exists(partial_path)):
+        return 0, None
+    offset = min(int(checkpoint.get('offset', 0)), os.path.getsize(partial_path))
+    with open(partial_path, 'r+b') as f:
+        f.truncate(offset)
+    return offset, checkpoint['etag']
+
+def range_headers(offset, etag):
+    """Request headers to resume at offset, {} if the download has to start over.
+
+    If-Range makes the server send the whole file (200) instead of the
+    range when it no longer matches the ETag the bytes on disk came from.
+    """
+    if not offset or not etag:
+        return {}
+    return {'Range': f"bytes={offset}-", 'If-Range': etag}
+
+def save_session(output_dir, repo_id, files, paused=False):
+    _write_json(os.path.join(output_dir, SESSION_FILENAME),
+                {'repo_id': repo_id, 'files': list(files), 'paused': paused})
+
+def load_session(output_dir):
+    if not output_dir:
+        return None
+    return _read_json(os.path.join(output_dir, SESSION_FILENAME))
+
+def clear_session(output_dir):
+    _remove(os.path.join(output_dir, SESSION_FILENAME))
+
+def repo_dir(save_path, repo_id):
+    """Subdirectory of save_path for repo_id when several repos share save_path"""
+    return os.path.join(save_path, *repo_id.split('/'))
+
+def mark_repo_dir(output_dir, repo_id):
+    os.makedirs(output_dir, exist_ok=True)
+    _write_json(os.path.join(output_dir, REPO_MARKER), {'repo_id': repo_id})
+
+def load_repo_marker(output_dir):
+    data = _read_json(os.path.join(output_dir, REPO_MARKER))
+    return data.get('repo_id') if data else None
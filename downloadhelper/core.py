@@ -0,0 +1,337 @@
+import os
+import re
+import threading
+import time
+from .checkpoint import mark_repo_dir, repo_dir
+from .metadata import DEFAULT_FETCH_WORKERS, discover_part_repos, fetch_many, get_file_hashes, get_file_sizes
+from .fastpath import format_size
+from .planner import plan_download, apply_evictions, hf_cache_dir, hf_cache_entry, space_reservations
+from .progress import ProgressTracker, format_summary
+from .scheduler import DownloadScheduler, get_policy
+
+# huggingface_hub is imported inside the methods that use it so that
+# importing this module (and `python -m downloadhelper --help`) stays fast.
+
+PART_PATTERN = re.compile(r'part(\d+)')
+PROGRESS_POLL_INTERVAL = 1.0  # Seconds between reads of the running downloads' sizes
+
+class DownloadManager:
+    def __init__(self):
+        self.active_downloads = set()
+        self._lock = threading.Lock()
+    
+    def is_active(self, model_id):
+        with self._lock:
+            return model_id in self.active_downloads
+    
+    def add_download(self, model_id):
+        with self._lock:
+            if model_id in self.active_downloads:
+                return False
+            self.active_downloads.add(model_id)
+            return True
+    
+    def active(self):
+        with self._lock:
+            return set(self.active_downloads)
+    
+    def remove_download(self, model_id):
+        with self._lock:
+            if model_id in self.active_downloads:
+                self.active_downloads.remove(model_id)
+
+# Global download manager instance
+download_manager = DownloadManager()
+
+class HuggingfaceDownloader:
+    def __init__(self, save_path="./models", use_auth=True, token=None, no_auto_next=False,
+                 policy="priority", max_workers=1, progress_interval=10, quota=None, evict_dirs=(),
+                 evict_cache=False, metadata_workers=DEFAULT_FETCH_WORKERS):
+        self.save_path = save_path
+        self.use_auth = use_auth
+        self.token = token or os.environ.get("HF_TOKEN")
+        self.no_auto_next = no_auto_next
+        self.scheduler = DownloadScheduler(self._run_job, policy=get_policy(policy), max_workers=max_workers)
+        self.progress = ProgressTracker()
+        self.progress_interval = progress_interval  # Seconds between summary lines, 0 disables them
+        self.quota = quota  # Max bytes in save_path, None for no limit
+        self.evict_dirs = list(evict_dirs)  # Directories whose old subfolders may be deleted for space
+        self.evict_cache = evict_cache  # Allow deleting least-recently-used Hub cache repos
+        self.reservations = {}  # model_id -> reserved disk space
+        self.local_dirs = {}  # model_id -> directory of repos being downloaded
+        self.metadata_workers = metadata_workers
+        self._running = {}  # (repo_id, filename) -> [running job, temp file seen yet]
+        self._running_lock = threading.Lock()
+        
+        # Create directory if it doesn't exist
+        os.makedirs(save_path, exist_ok=True)
+    
+    def _run_job(self, job):
+        from huggingface_hub import hf_hub_download
+        
+        # hf_hub_download has no byte-level callback, _poll_running() follows its temp file instead
+        key = (job.repo_id, job.filename)
+        self.progress.start(key, job.size)
+        with self._running_lock:
+            self._running[key] = [job, False]
+        try:
+            hf_hub_download(
+                repo_id=job.repo_id,
+                filename=job.filename,
+                revision=job.context.get('revision'),
+                token=self.token if self.use_auth else None,
+                local_dir=job.context.get('local_dir', self.save_path),
+                resume_download=job.context.get('resume', True)
+            )
+            self.progress.update(key, job.size)
+            self.progress.finish(key, True)
+            print(f"Successfully downloaded {job.filename} from {job.repo_id}")
+            return True
+        except Exception as e:
+            self.progress.finish(key, False)
+            print(f"Error downloading {job.filename}: {e}")
+            return False
+        finally:
+            with self._running_lock:
+                self._running.pop(key, None)
+    
+    def _incomplete_size(self, job):
+        """Bytes hf_hub_download has written so far for job, or None if its temp file isn't found.
+
+        The temp file is named after the file's etag, which is the LFS sha256
+        for the large files where progress matters. Newer huggingface_hub
+        versions keep it under local_dir/.cache, older ones in the Hub cache.
+        """
+        sha256 = job.context.get('sha256')
+        if not sha256:
+            return None
+        local_dir = job.context.get('local_dir', self.save_path)
+        folders = [
+            os.path.join(local_dir, '.cache', 'huggingface', 'download', os.path.dirname(job.filename)),
+            os.path.join(hf_cache_dir(), f"models--{job.repo_id.replace('/', '--')}", 'blobs'),
+        ]
+        for folder in folders:
+            try:
+                names = os.listdir(folder)
+            except OSError:
+                continue
+            for name in names:
+                if name.endswith(f"{sha256}.incomplete"):
+                    try:
+                        return os.path.getsize(os.path.join(folder, name))
+                    except OSError:
+                        pass
+        return None
+    
+    def _poll_running(self):
+        with self._running_lock:
+            running = list(self._running.items())
+        for key, entry in running:
+            downloaded = self._incomplete_size(entry[0])
+            if downloaded is None:
+                continue
+            if entry[1]:
+                self.progress.update(key, downloaded)
+            else:
+                # Bytes resumed from an earlier run are not part of the current rate
+                self.progress.start(key, entry[0].size, downloaded)
+                entry[1] = True
+    
+    def repo_dir(self, model_id):
+        """Own subdirectory for repos downloaded together with others, so their files don't collide"""
+        return repo_dir(self.save_path, model_id)
+    
+    def _submit(self, model_id, revision=None, filenames=None, resume=True, local_dir=None):
+        # Check if this model is already being downloaded
+        if not download_manager.add_download(model_id):
+            print(f"Model {model_id} is already being downloaded. Skipping.")
+            return None
+        
+        try:
+            print(f"Starting download of {model_id}")
+            
+            # Get model files, with sizes when the metadata is available
+            token = self.token if self.use_auth else None
+            sizes = get_file_sizes(model_id, revision=revision, token=token)
+            if sizes:
+                files = list(sizes)
+            else:
+                from huggingface_hub import HfApi
+                api = HfApi(token=token)
+                files = api.list_repo_files(model_id, revision=revision)
+            
+            if filenames:
+                files = [f for f in files if f in filenames]
+            
+            local_dir = local_dir or self.save_path
+            hashes = get_file_hashes(model_id, revision)
+            self.local_dirs[model_id] = local_dir
+            if not self._check_space(model_id, {f: sizes.get(f) for f in files}, local_dir, hashes):
+                self._release(model_id)
+                return None
+            if local_dir != self.save_path:
+                mark_repo_dir(local_dir, model_id)
+            
+            for file in files:
+                self.progress.plan((model_id, file), sizes.get(file, 0))
+            return [self.scheduler.submit(model_id, file, sizes.get(file, 0), revision=revision, resume=resume,
+                                          local_dir=local_dir, sha256=hashes.get(file))
+                    for file in files]
+        except Exception:
+            self._release(model_id)
+            raise
+    
+    def _check_space(self, model_id, file_sizes, local_dir, file_hashes):
+        # Other repos of this run (and in other downloaders, their cache entries) are in use
+        protect = [d for m, d in self.local_dirs.items() if m != model_id]
+        protect += [hf_cache_entry(m) for m in download_manager.active()]
+        plan = plan_download(local_dir, file_sizes, quota=self.quota, evict_roots=self.evict_dirs,
+                             evict_cache=self.evict_cache, quota_dir=self.save_path, file_hashes=file_hashes,
+                             repo_id=model_id, protect=protect)
+        print(f"Disk plan for {model_id}: {plan.summary()}")
+        if not plan.fits:
+            if not plan.evictions:
+                print(f"Not enough space for {model_id}. Skipping.")
+                return False
+            for candidate in plan.evictions:
+                print(f"Evicting {candidate.path}")
+            freed, errors = apply_evictions(plan)
+            for path, error in errors:
+                print(f"Could not delete {path}: {error}")
+            if not plan.fits:
+                print(f"Freed only {format_size(freed)}, not enough space for {model_id}. Skipping.")
+                return False
+        self.reservations[model_id] = plan.reserve()
+        return True
+    
+    def _release_space(self, model_id):
+        # The files are on disk now, so free space already accounts for them
+        space_reservations.release(self.reservations.pop(model_id, None))
+    
+    def _release(self, model_id):
+        self._release_space(model_id)
+        self.local_dirs.pop(model_id, None)
+        download_manager.remove_download(model_id)
+    
+    def _wait(self, jobs):
+        # Follow the running downloads' bytes and print an aggregate rate/ETA line every progress_interval
+        last_summary = time.monotonic()
+        while not self.scheduler.wait(jobs, PROGRESS_POLL_INTERVAL):
+            self._poll_running()
+            if self.progress_interval and time.monotonic() - last_summary >= self.progress_interval:
+                print(format_summary(self.progress.snapshot()))
+                last_summary = time.monotonic()
+    
+    def download(self, model_id, revision=None, filenames=None, resume=True, separate_dir=None):
+        """Download one repo into save_path, or into its own subdirectory when separate_dir is set.
+
+        By default a repo gets its own subdirectory when its next parts will
+        be queued after it, since the parts share file names like config.json.
+        """
+        if separate_dir is None:
+            separate_dir = not self.no_auto_next and PART_PATTERN.search(model_id) is not None
+        local_dir = self.repo_dir(model_id) if separate_dir else self.save_path
+        jobs = self._submit(model_id, revision, filenames, resume, local_dir)
+        if jobs is None:
+            return False
+        
+        try:
+            self._wait(jobs)
+            self._release_space(model_id)
+            
+            # Check if we should queue the next part
+            self.queue_next_part(model_id)
+            
+            return True
+        finally:
+            # Always remove from active downloads when done
+            self._release(model_id)
+    
+    def prefetch_metadata(self, model_ids, revision=None):
+        """Resolve file lists and sizes of many repos concurrently, returns the repos that resolved"""
+        results, errors = fetch_many(model_ids, revision=revision, token=self.token if self.use_auth else None,
+                                     max_workers=self.metadata_workers)
+        for model_id, error in errors.items():
+            print(f"Error retrieving files of {model_id}: {error}")
+        return [model_id for model_id in model_ids if model_id in results]
+    
+    def plan_multiple(self, model_ids, revision=None):
+        """Print the disk plan of each repo without downloading anything"""
+        plans = {}
+        for model_id in self.prefetch_metadata(model_ids, revision):
+            sizes = get_file_sizes(model_id, revision=revision, fetch=False)
+            plans[model_id] = plan_download(self.repo_dir(model_id), sizes, quota=self.quota,
+                                            quota_dir=self.save_path,
+                                            file_hashes=get_file_hashes(model_id, revision), repo_id=model_id)
+            print(f"{model_id}: {len(sizes)} files, {plans[model_id].summary()}")
+        if plans:
+            needed = sum(plan.needed_bytes for plan in plans.values())
+            available = next(iter(plans.values())).available_bytes
+            print(f"Total for {len(plans)} repos: {format_size(needed)} to download, "
+                  f"{format_size(available)} available")
+        return plans
+    
+    def download_multiple(self, model_ids, max_workers=2, revision=None, resume=True):
+        """Download several repos at once, ordered by the scheduling policy.
+
+        Each repo goes into its own subdirectory of save_path.
+        """
+        self.scheduler.max_workers = max(self.scheduler.max_workers, max_workers)
+        
+        # One concurrent metadata pass instead of a request per repo as it's submitted
+        resolved = self.prefetch_metadata(model_ids, revision)
+        
+        submitted = {}
+        for model_id in resolved:
+            jobs = self._submit(model_id, revision, None, resume, self.repo_dir(model_id))
+            if jobs is not None:
+                submitted[model_id] = jobs
+        
+        results = {model_id: False for model_id in model_ids}
+        for model_id, jobs in submitted.items():
+            try:
+                self._wait(jobs)
+                self._release_space(model_id)
+                self.queue_next_part(model_id)
+                results[model_id] = True
+            finally:
+                self._release(model_id)
+        return results
+    
+    def queue_next_part(self, current_model_id):
+        """Queue the next part if auto-queuing is enabled"""
+        if self.no_auto_next:
+            return
+            
+        # Parse the current model ID to find the part number
+        match = PART_PATTERN.search(current_model_id)
+        if not match:
+            return
+            
+        current_part = int(match.group(1))
+        next_part = current_part + 1
+        base_model_id = current_model_id.replace(f"part{current_part}", f"part{next_part}")
+        
+        # One search finds the sibling parts instead of guessing. Only trust a
+        # result that found the current repo, otherwise fall back to the guess
+        token = self.token if self.use_auth else None
+        parts = discover_part_repos(current_model_id, token=token)
+        if parts and parts.get(current_part) == current_model_id:
+            if next_part not in parts:
+                print(f"No next part found after {current_model_id}.")
+                return
+            base_model_id = parts[next_part]
+        
+        # Only the part that is queued next needs its metadata now, which also confirms it exists
+        _, errors = fetch_many([base_model_id], token=token, max_workers=1)
+        if base_model_id in errors:
+            print(f"No next part found after {current_model_id}: {errors[base_model_id]}")
+            return
+        
+        # Don't queue if already downloading
+        if download_manager.is_active(base_model_id):
+            print(f"Next part {base_model_id} is already downloading. Not queuing.")
+            return
+            
+        print(f"Queuing next part: {base_model_id}")
+        self.download(base_model_id, separate_dir=True)
@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+from collections import deque
+
+# Write-behind disk writer: the network thread hands chunks to a bounded
+# in-memory buffer and dedicated writer threads flush them to disk, so a slow
+# volume no longer stalls the socket read loop.
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024  # 64 MB of buffered chunks
+DEFAULT_WRITER_THREADS = 2
+
+class DiskWriteError(IOError):
+    pass
+
+class WriteHandle:
+    """File handle returned by DiskWriterPool.open().
+
+    With on_sync, the writer thread fsyncs the file every sync_interval
+    seconds and then calls on_sync(offset) with the end of the contiguous
+    prefix that is on disk, so checkpoints never stall the network thread.
+    """
+
+    def __init__(self, pool, path, mode, on_sync=None, sync_interval=None):
+        self.pool = pool
+        self.path = path
+        self.on_sync = on_sync
+        self.sync_interval = sync_interval
+        if 'a' in mode:
+            # Chunks may land out of order, so appends need a seekable handle
+            self._file = open(path, 'r+b' if os.path.exists(path) else 'wb')
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(path, mode)
+        self._offset = self._file.tell()
+        self._contiguous = self._offset  # Everything before this offset has been written
+        self._landed = {}  # offset -> end of chunks written past a gap
+        self._last_sync = time.monotonic()
+        self._pending = 0  # Chunks queued but not yet on disk
+        self._unsynced = 0  # Bytes written since the last fsync
+        self._error = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    def write(self, data):
+        if self._closed:
+            raise ValueError("write to closed handle")
+        self._raise_error()
+        offset = self._offset
+        self._offset += len(data)
+        with self._lock:
+            self._pending += 1
+        self.pool._enqueue(self, offset, data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self, sync=False):
+        """Wait until every queued chunk is written; sync=True also fsyncs the file"""
+        with self._idle:
+            while self._pending > 0:
+                self._idle.wait()
+            if sync and self._error is None:
+                self._fsync()
+        self._raise_error()
+
+    def close(self, discard=False, sync=False):
+        """Drain pending chunks and close; discard=True drops write errors"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            with self._idle:
+                while self._pending > 0:
+                    self._idle.wait()
+                if self._error is None and (sync or self.pool.fsync_bytes is not None):
+                    self._fsync()
+        finally:
+            self._file.close()
+        if discard:
+            self._error = None
+        self._raise_error()
+
+    def _fsync(self):
+        # Called with the lock held and no chunks pending
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        except OSError as e:
+            self._error = e
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise DiskWriteError(f"Error writing {self.path}: {error}") from error
+
+    def _advance(self, offset, end):
+        # Chunks of one handle can land out of order across writer threads
+        if offset != self._contiguous:
+            self._landed[offset] = end
+            return
+        self._contiguous = end
+        while self._contiguous in self._landed:
+            self._contiguous = self._landed.pop(self._contiguous)
+
+    def _write_chunk(self, offset, data):
+        with self._lock:
+            try:
+                if self._error is None:
+                    self._file.seek(offset)
+                    self._file.write(data)
+                    self._unsynced += len(data)
+                    self._advance(offset, offset + len(data))
+                    fsync_bytes = self.pool.fsync_bytes
+                    checkpoint_due = (self.on_sync is not None and
+                                      time.monotonic() - self._last_sync >= self.sync_interval)
+                    if checkpoint_due or (fsync_bytes and self._unsynced >= fsync_bytes):
+                        self._file.flush()
+                        os.fsync(self._file.fileno())
+                        self._unsynced = 0
+                    if checkpoint_due:
+                        self._last_sync = time.monotonic()
+                        self.on_sync(self._contiguous)
+            except Exception as e:
+                # Any failure is reported to the writer; the thread itself must survive
+                self._error = e
+            finally:
+                self._pending -= 1
+                if self._pending == 0:
+                    self._idle.notify_all()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Don't mask the original exception with a late write error
+        self.close(discard=exc_type is not None)
+        return False
+
+class DiskWriterPool:
+    """Bounded write-behind queue served by dedicated writer threads.
+
+    memory_budget caps the bytes buffered across all handles; once it is
+    reached write() blocks, which pushes back on the network reader.
+    fsync_bytes batches fsync calls per handle (None disables fsync, 0 only
+    syncs on close).
+    """
+
+    def __init__(self, num_threads=DEFAULT_WRITER_THREADS, memory_budget=DEFAULT_MEMORY_BUDGET,
+                 fsync_bytes=None):
+        self.num_threads = max(1, num_threads)
+        self.memory_budget = max(1, memory_budget)
+        self.fsync_bytes = fsync_bytes
+        self.buffered_bytes = 0
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._threads = []
+
+    def open(self, path, mode='wb', on_sync=None, sync_interval=None):
+        self._start_threads()
+        return WriteHandle(self, path, mode, on_sync, sync_interval)
+
+    def _start_threads(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.num_threads):
+                thread = threading.Thread(target=self._writer_loop, name=f"disk-writer-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _enqueue(self, handle, offset, data):
+        size = len(data)
+        with self._not_full:
+            # A single chunk larger than the budget is let through on an empty buffer
+            while self.buffered_bytes > 0 and self.buffered_bytes + size > self.memory_budget:
+                self._not_full.wait()
+            self.buffered_bytes += size
+            self._queue.append((handle, offset, data))
+            self._not_empty.notify()
+
+    def _writer_loop(self):
+        while True:
+            with self._not_empty:
+                while not self._queue:
+                    self._not_empty.wait()
+                handle, offset, data = self._queue.popleft()
+            try:
+                handle._write_chunk(offset, data)
+            finally:
+                with self._not_full:
+                    self.buffered_bytes -= len(data)
+                    self._not_full.notify_all()
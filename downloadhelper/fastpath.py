@@ -0,0 +1,152 @@
+import argparse
+import hashlib
+import json
+import os
+from .checkpoint import (CHECKPOINT_SUFFIX, PARTIAL_SUFFIX, REPO_MARKER, SESSION_FILENAME, TEMP_SUFFIX,
+                         load_checkpoint, load_repo_marker, load_session, repo_dir)
+
+# Lightweight commands for scripts that call the CLI often. Only the standard
+# library is used here so they start without loading huggingface_hub/requests.
+
+HF_ENDPOINT = os.environ.get("HF_ENDPOINT", "https://huggingface.co")
+
+def fetch_repo_tree(repo_id, revision=None, token=None):
+    """Return {filename: {'size', 'sha256'}} from the Hub API"""
+    # urllib.request pulls in http.client and ssl, only pay for it when used
+    import urllib.parse
+    import urllib.request
+    
+    revision = urllib.parse.quote(revision or "main", safe="")
+    url = f"{HF_ENDPOINT}/api/models/{repo_id}/revision/{revision}?blobs=true"
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=30) as response:
+        data = json.load(response)
+    files = {}
+    for sibling in data.get('siblings', []):
+        lfs = sibling.get('lfs') or {}
+        files[sibling['rfilename']] = {
+            'size': sibling.get('size') or lfs.get('size') or 0,
+            'sha256': lfs.get('sha256')
+        }
+    return files
+
+def sha256_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{int(num_bytes)} B"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
+
+def _token(args):
+    if args.no_auth:
+        return None
+    return args.token or os.environ.get("HF_TOKEN")
+
+def cmd_status(args):
+    if not os.path.isdir(args.save_path):
+        print(f"{args.save_path} does not exist")
+        return 1
+    complete_count = complete_bytes = 0
+    partial = []
+    repos = {}  # repo subdirectory -> [repo_id, files, bytes]
+    for root, dirs, names in os.walk(args.save_path):
+        # Dot-directories hold tool state, e.g. huggingface_hub's .cache/huggingface/download records
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        if REPO_MARKER in names:
+            repos[root] = [load_repo_marker(root), 0, 0]
+        # Files count towards the innermost repo subdirectory containing them
+        repo = max((d for d in repos if root == d or root.startswith(d + os.sep)), key=len, default=None)
+        for name in names:
+            path = os.path.join(root, name)
+            if name.endswith((CHECKPOINT_SUFFIX, TEMP_SUFFIX)) or name in (SESSION_FILENAME, REPO_MARKER):
+                continue
+            size = os.path.getsize(path)
+            if name.endswith(PARTIAL_SUFFIX):
+                partial.append((path[:-len(PARTIAL_SUFFIX)], size))
+            else:
+                complete_count += 1
+                complete_bytes += size
+                if repo is not None:
+                    repos[repo][1] += 1
+                    repos[repo][2] += size
+    print(f"{args.save_path}: {complete_count} files, {format_size(complete_bytes)}")
+    for repo_id, count, nbytes in sorted(repos.values(), key=lambda r: r[0] or ""):
+        print(f"  {repo_id}: {count} files, {format_size(nbytes)}")
+    session = load_session(args.save_path)
+    if session:
+        state = "paused" if session.get('paused') else "queued"
+        print(f"  {state}: {session['repo_id']}, {len(session.get('files', []))} files left")
+    for output_path, size in sorted(partial):
+        line = f"  partial: {os.path.relpath(output_path, args.save_path)} ({format_size(size)}"
+        checkpoint = load_checkpoint(output_path)
+        if checkpoint and checkpoint.get('size') and checkpoint.get('etag'):
+            line += f" of {format_size(checkpoint['size'])}, resumable from {format_size(checkpoint['offset'])}"
+        print(line + ")")
+    return 0
+
+def cmd_list(args):
+    files = fetch_repo_tree(args.model_id, args.revision, _token(args))
+    total = 0
+    for name, info in sorted(files.items()):
+        total += info['size']
+        print(f"{format_size(info['size']):>10}  {name}")
+    print(f"{len(files)} files, {format_size(total)}")
+    return 0
+
+def cmd_verify(args):
+    files = fetch_repo_tree(args.model_id, args.revision, _token(args))
+    # Repos downloaded together with others live in their own subdirectory
+    output_dir = repo_dir(args.save_path, args.model_id)
+    if not os.path.isdir(output_dir):
+        output_dir = args.save_path
+    problems = 0
+    for name, info in sorted(files.items()):
+        path = os.path.join(output_dir, name)
+        if not os.path.isfile(path):
+            status = "missing"
+        elif info['size'] and os.path.getsize(path) != info['size']:
+            status = f"size mismatch ({os.path.getsize(path)} != {info['size']})"
+        elif info['sha256'] and not args.no_hash and sha256_file(path) != info['sha256']:
+            status = "hash mismatch"
+        else:
+            continue
+        problems += 1
+        print(f"✗ {name}: {status}")
+    print(f"{len(files) - problems} of {len(files)} files OK in {output_dir}")
+    return 1 if problems else 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="downloadhelper", description="Quick download helper commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    status = subparsers.add_parser("status", help="Show downloaded and partial files")
+    status.add_argument("--save-path", default="./models", help="Directory the models are saved in")
+    status.set_defaults(func=cmd_status)
+
+    for name, func, help_text in (("list", cmd_list, "List the files of a repo"),
+                                  ("verify", cmd_verify, "Check local files against the repo")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("model_id", help="Huggingface model ID")
+        sub.add_argument("--revision", help="Branch or commit")
+        sub.add_argument("--no-auth", action="store_true", help="Disable authentication")
+        sub.add_argument("--token", help="Huggingface token")
+        sub.set_defaults(func=func)
+        if name == "verify":
+            sub.add_argument("--save-path", default="./models", help="Directory the model was saved to")
+            sub.add_argument("--no-hash", action="store_true", help="Only compare file sizes")
+    return parser
+
+def main(argv):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except OSError as e:  # Includes urllib's URLError/HTTPError
+        print(f"Error: {e}")
+        return 1
@@ -0,0 +1,934 @@
+import os
+import sys
+import requests
+import re
+import time
+import threading
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+                            QHBoxLayout, QPushButton, QLabel, QLineEdit, 
+                            QFileDialog, QProgressBar, QSlider, QListWidget, 
+                            QListWidgetItem, QMessageBox, QMenu, QScrollArea, QCheckBox)
+from PyQt5.QtCore import Qt, pyqtSignal, QObject, QTimer, QSettings
+from .checkpoint import (range_headers, resume_point, save_checkpoint, clear_checkpoint, load_session,
+                         save_session, clear_session)
+from .diskwriter import DiskWriterPool
+from .metadata import get_file_sizes, get_repo_metadata
+from .planner import plan_download, apply_evictions, parse_size, space_reservations
+from .fastpath import format_size
+from .progress import ProgressTracker, format_duration
+from .scheduler import DownloadScheduler, PRIORITY_URGENT
+
+# Shared state object for communication between threads
+class DownloadState(QObject):
+    progress_update = pyqtSignal(str, int, float, float, float)  # filename, percent, MB, total MB, MB/s
+    aggregate_update = pyqtSignal(float, float, float)  # bytes/s, remaining bytes, ETA seconds (-1 if unknown)
+    download_complete = pyqtSignal(str, bool)
+    file_list_ready = pyqtSignal(list, dict)  # Files and their sizes, {} if unknown
+    status_update = pyqtSignal(str)
+    speed_changed = pyqtSignal(int)
+    download_started = pyqtSignal(str)  # New signal for when a download starts
+    
+    def __init__(self):
+        super().__init__()
+        self.current_rate_limit = 500  # Initial rate limit in KB/s
+        self.should_pause = False
+        self.should_cancel = False
+        self.active_downloads = {}  # Track active downloads
+        self.active_downloads_lock = threading.Lock()
+        
+    def on_speed_changed(self, new_value):
+        self.current_rate_limit = new_value
+        
+    def register_download(self, filename, repo_id=None):
+        with self.active_downloads_lock:
+            self.active_downloads[filename] = {
+                'repo_id': repo_id,
+                'start_time': time.time(),
+                'downloaded': 0
+            }
+            
+    def update_download_progress(self, filename, bytes_downloaded):
+        with self.active_downloads_lock:
+            if filename in self.active_downloads:
+                self.active_downloads[filename]['downloaded'] = bytes_downloaded
+                
+    def get_current_rate_per_download(self, repo_id=None):
+        if repo_id is not None:
+            # Split bandwidth between repos by their scheduler weights
+            return max(50, scheduler.rate_share(repo_id, self.current_rate_limit))
+        with self.active_downloads_lock:
+            active_count = len(self.active_downloads)
+            if active_count > 0:
+                # Divide bandwidth among active downloads, with a minimum per download
+                return max(50, self.current_rate_limit / active_count)
+            return self.current_rate_limit
+            
+    def unregister_download(self, filename):
+        with self.active_downloads_lock:
+            if filename in self.active_downloads:
+                del self.active_downloads[filename]
+        
+download_state = DownloadState()
+speed_mutex = threading.Lock() # Mutex for thread-safe access to speed limit
+disk_writer = DiskWriterPool()  # Write-behind buffer so slow disks don't stall the socket
+progress_tracker = ProgressTracker()  # Moving-window rates and ETA for all files
+CHECKPOINT_INTERVAL = 5  # Seconds between durable offset checkpoints
+
+def get_model_files(repo_id, token=None):
+    """{filename: {'size', 'sha256'}} from a single Hub request (or the metadata cache)"""
+    try:
+        return get_repo_metadata(repo_id, token=token)
+    except Exception as e:
+        download_state.status_update.emit(f"Error retrieving files: {str(e)}")
+        return {}
+
+def sort_model_files(files):
+    # Identifiziere Shard-Dateien (model-00001-of-00005.safetensors etc.)
+    shard_pattern = r'.*-\d+-of-\d+\..*'
+    
+    shard_files = [f for f in files if re.match(shard_pattern, os.path.basename(f))]
+    other_files = [f for f in files if f not in shard_files]
+    
+    # Sortiere Shard-Dateien nach ihrer Nummer
+    def get_shard_number(filename):
+        match = re.search(r'-(\d+)-of-', os.path.basename(filename))
+        if match:
+            return int(match.group(1))
+        return 0
+    
+    shard_files.sort(key=get_shard_number)
+    
+    # Konfigurationsdateien zuerst, dann Shards, dann Rest
+    config_files = [f for f in other_files if f.endswith(('.json', '.txt', '.md'))]
+    remaining_files = [f for f in other_files if f not in config_files]
+    
+    return config_files + shard_files + remaining_files
+
+def download_file_with_rate_limit(repo_id, filename, output_dir, token=None):
+    output_path = os.path.join(output_dir, filename)
+    
+    # Erstelle Verzeichnisstruktur
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    
+    # URL zur Datei
+    file_url = f"https://huggingface.co/{repo_id}/resolve/main/{filename}"
+    if token:
+        file_url += f"?token={token}"
+    
+    download_state.status_update.emit(f"Downloading {filename}...")
+    
+    # Register this download and notify UI
+    download_state.register_download(filename, repo_id)
+    download_state.download_started.emit(filename)
+    
+    def fail(message):
+        if message:
+            download_state.status_update.emit(message)
+        progress_tracker.finish(filename, False)
+        download_state.unregister_download(filename)
+        download_state.download_complete.emit(filename, False)
+        return False
+    
+    # Pick up where a paused or interrupted run left off, also across restarts
+    temp_path = output_path + ".partial"
+    try:
+        downloaded, etag = resume_point(output_path, repo_id)
+    except OSError as e:
+        return fail(f"Error reading partial download: {str(e)}")
+    chunk_size = 8192  # 8KB chunks
+    started = False
+    
+    while True:
+        # Starte Download mit manuellem Chunk-Downloading für Ratenbegrenzung
+        headers = range_headers(downloaded, etag)
+        if not headers:
+            downloaded = 0
+        try:
+            response = requests.get(file_url, stream=True, headers=headers)
+            response.raise_for_status()
+        except Exception as e:
+            return fail(f"Error starting download: {str(e)}")
+        
+        if response.status_code != 206:
+            downloaded = 0  # Range not honoured or file changed, start from the beginning
+            etag = response.headers.get('ETag')
+        total_size = downloaded + int(response.headers.get('content-length', 0))
+        if not started:
+            progress_tracker.start(filename, total_size, downloaded)
+            started = True
+        
+        paused = False
+        try:
+            # The writer threads fsync and checkpoint the flushed bytes so a crash or
+            # restart can resume from there, without stalling this thread on the disk
+            f = disk_writer.open(
+                temp_path, 'ab' if downloaded else 'wb', sync_interval=CHECKPOINT_INTERVAL,
+                on_sync=lambda offset, size=total_size, etag=etag: save_checkpoint(
+                    output_path, repo_id, offset, size, etag))
+        except OSError as e:
+            response.close()
+            return fail(f"Error opening {temp_path}: {str(e)}")
+        with f:
+            start_time = time.time()
+            start_offset = downloaded
+            last_update_time = start_time
+            update_interval = 0.5  # Update UI every 0.5 seconds
+            
+            try:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if download_state.should_cancel:
+                        f.close(discard=True)
+                        response.close()
+                        return fail("Download abgebrochen.")
+                    
+                    # Leave the loop on pause so the connection can be released
+                    if download_state.should_pause:
+                        paused = True
+                        break
+                        
+                    if chunk:
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        download_state.update_download_progress(filename, downloaded)
+                        progress_tracker.update(filename, downloaded)
+                        
+                        # Berechne die Dauer und passe die Geschwindigkeit an
+                        elapsed = time.time() - start_time
+                        current_limit = download_state.get_current_rate_per_download(repo_id)
+                        
+                        if elapsed > 0:
+                            rate = (downloaded - start_offset) / elapsed / 1024  # KB/s
+                            
+                            # Wenn wir zu schnell sind, warten wir ein bisschen
+                            if rate > current_limit:
+                                time_to_sleep = ((downloaded - start_offset) / (current_limit * 1024)) - elapsed
+                                if time_to_sleep > 0:
+                                    time.sleep(time_to_sleep)
+                        
+                        # Update progress UI at regular intervals
+                        current_time = time.time()
+                        if current_time - last_update_time >= update_interval:
+                            last_update_time = current_time
+                            rate = progress_tracker.file_rate(filename)
+                            percent = int(100 * downloaded / total_size) if total_size > 0 else 0
+                            download_state.progress_update.emit(filename, percent, downloaded/(1024*1024),
+                                                                total_size/(1024*1024), rate/(1024*1024))
+                
+                # Wait for the writer threads so disk errors surface here, a pause
+                # also fsyncs so the checkpoint below never runs ahead of the data
+                f.close(sync=paused)
+            
+            except Exception as e:
+                f.close(discard=True)
+                response.close()
+                return fail(f"Error during download: {str(e)}")
+        
+        response.close()
+        if not paused:
+            break
+        
+        # Everything up to `downloaded` is on disk now; wait without holding a socket
+        save_checkpoint(output_path, repo_id, downloaded, total_size, etag)
+        download_state.status_update.emit(f"Paused {filename} at {downloaded/(1024*1024):.1f} MB")
+        while download_state.should_pause and not download_state.should_cancel:
+            time.sleep(0.1)
+        if download_state.should_cancel:
+            return fail("Download abgebrochen.")
+        download_state.status_update.emit(f"Resuming {filename}...")
+    
+    # Unregister download before finalizing
+    download_state.unregister_download(filename)
+    clear_checkpoint(output_path)
+    
+    # Rename the partial file to the final filename
+    try:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        os.rename(temp_path, output_path)
+    except Exception as e:
+        download_state.status_update.emit(f"Error renaming file: {str(e)}")
+        progress_tracker.finish(filename, False)
+        download_state.download_complete.emit(filename, False)
+        return False
+        
+    progress_tracker.finish(filename, True)
+    download_state.status_update.emit(f"✓ Successfully downloaded: {filename}")
+    download_state.download_complete.emit(filename, True)
+    return True
+
+def run_scheduled_download(job):
+    if download_state.should_cancel:
+        # Picked up just before Cancel dropped it, report it like any cancelled job
+        progress_tracker.finish(job.filename, False)
+        download_state.download_complete.emit(job.filename, False)
+        return False
+    success = download_file_with_rate_limit(job.repo_id, job.filename, job.context['output_dir'],
+                                            job.context.get('token'))
+    if not success and not download_state.should_cancel:
+        download_state.status_update.emit(f"Download of {job.filename} failed. Continuing with next file...")
+    return success
+
+# Orders files across repos and the per-file "Download this file" requests,
+# with a spare worker so a requested file starts even while both others are busy
+scheduler = DownloadScheduler(run_scheduled_download, max_workers=2, urgent_workers=1)
+
+def cancel_scheduled(repo_id=None):
+    """Drop pending jobs of repo_id (or all of them) and report each as failed"""
+    for job in scheduler.cancel(repo_id):
+        progress_tracker.finish(job.filename, False)
+        download_state.download_complete.emit(job.filename, False)
+
+def download_thread_func(repo_id, output_dir, file_list, token=None, reservation=None):
+    download_state.status_update.emit(f"Starting downloads for {repo_id}...")
+    
+    # File sizes let the scheduler run short jobs first
+    sizes = get_file_sizes(repo_id, token=token)
+    for filename in file_list:
+        progress_tracker.plan(filename, sizes.get(filename, 0))
+    jobs = [scheduler.submit(repo_id, filename, sizes.get(filename, 0), output_dir=output_dir, token=token)
+            for filename in file_list]
+    
+    for job in jobs:
+        while not job.done.wait(0.2):
+            if download_state.should_cancel:
+                cancel_scheduled(repo_id)
+        if download_state.should_cancel:
+            download_state.status_update.emit("All downloads canceled.")
+            cancel_scheduled(repo_id)
+            break
+    
+    space_reservations.release(reservation)
+    download_state.status_update.emit("All downloads completed" if not download_state.should_cancel else "Downloads canceled")
+
+def get_files_thread_func(repo_id, token=None):
+    download_state.status_update.emit(f"Retrieving file list for {repo_id}...")
+    files = get_model_files(repo_id, token)
+    if files:
+        sorted_files = sort_model_files(list(files))
+        # Sizes come with the list so the GUI thread never waits on the Hub for them
+        sizes = {name: info['size'] for name, info in files.items()}
+        download_state.file_list_ready.emit(sorted_files, sizes)
+        download_state.status_update.emit(f"Found: {len(sorted_files)} files to download")
+    else:
+        download_state.status_update.emit("No files found or error retrieving file list.")
+        download_state.file_list_ready.emit([], {})
+
+class ProgressBarWidget(QWidget):
+    def __init__(self, filename, parent=None):
+        super().__init__(parent)
+        self.filename = filename
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        # File label
+        self.label = QLabel(f"Downloading: {filename}")
+        layout.addWidget(self.label)
+        
+        # Progress info layout
+        info_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        info_layout.addWidget(self.progress_bar, 1)  # Give progress bar stretch priority
+        self.details_label = QLabel("0 MB / 0 MB (0%)")
+        info_layout.addWidget(self.details_label)
+        layout.addLayout(info_layout)
+        
+        self.setLayout(layout)
+    
+    def update_progress(self, percent, downloaded_mb, total_mb, rate_mb):
+        self.progress_bar.setValue(percent)
+        self.details_label.setText(f"{downloaded_mb:.1f} MB / {total_mb:.1f} MB ({percent}%) - {rate_mb:.2f} MB/s")
+    
+    def mark_complete(self, success):
+        if success:
+            self.label.setText(f"✓ Completed: {self.filename}")
+            self.progress_bar.setValue(100)
+        else:
+            self.label.setText(f"✗ Failed: {self.filename}")
+
+class HuggingFaceDownloaderGUI(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Hugging Face Model Downloader")
+        self.setGeometry(100, 100, 800, 600)
+        
+        self.file_list = []
+        self.file_sizes = {}  # Sizes that came with the file list
+        self.download_thread = None
+        self.current_downloading_file = None
+        self.progress_bars = {}  # Dictionary to store progress bar widgets by filename
+        self.settings = QSettings("Huggingface-Downloadhelper", "Downloadhelper")
+        self.session = None  # Durable record of the queued files, see checkpoint.py
+        self.session_dir = None
+        self.restored_files = None
+        self.restored_paused = False
+        
+        self.init_ui()
+        self.connect_signals()
+        self.restore_session()
+        
+    def init_ui(self):
+        main_widget = QWidget()
+        self.main_layout = QVBoxLayout()
+        
+        # Input section
+        input_layout = QVBoxLayout()
+        
+        repo_layout = QHBoxLayout()
+        repo_layout.addWidget(QLabel("Repository ID:"))
+        self.repo_id_input = QLineEdit()
+        self.repo_id_input.setPlaceholderText("e.g., nbeerbower/Mistral-Nemo-Gutenberg-Doppel-12B-v2")
+        repo_layout.addWidget(self.repo_id_input)
+        self.load_files_btn = QPushButton("Load Files")
+        repo_layout.addWidget(self.load_files_btn)
+        
+        output_layout = QHBoxLayout()
+        output_layout.addWidget(QLabel("Output Directory:"))
+        self.output_dir_input = QLineEdit()
+        self.output_dir_input.setPlaceholderText("Path to save files")
+        output_layout.addWidget(self.output_dir_input)
+        self.browse_btn = QPushButton("Browse...")
+        output_layout.addWidget(self.browse_btn)
+        output_layout.addWidget(QLabel("Quota:"))
+        self.quota_input = QLineEdit()
+        self.quota_input.setPlaceholderText("e.g. 200G (optional)")
+        self.quota_input.setMaximumWidth(140)
+        output_layout.addWidget(self.quota_input)
+        
+        # Nothing is evicted unless the user names the folders (or the cache) that may be cleaned up
+        evict_layout = QHBoxLayout()
+        evict_layout.addWidget(QLabel("Free space from:"))
+        self.evict_dirs_input = QLineEdit(self.settings.value("evict_dirs", ""))
+        self.evict_dirs_input.setPlaceholderText(
+            f"Folders whose old subfolders may be deleted, separated by '{os.pathsep}' (optional)")
+        evict_layout.addWidget(self.evict_dirs_input)
+        self.evict_cache_checkbox = QCheckBox("Hugging Face cache")
+        self.evict_cache_checkbox.setChecked(self.settings.value("evict_cache", False, type=bool))
+        evict_layout.addWidget(self.evict_cache_checkbox)
+        
+        token_layout = QHBoxLayout()
+        token_layout.addWidget(QLabel("API Token (optional):"))
+        self.token_input = QLineEdit()
+        self.token_input.setPlaceholderText("For private repositories")
+        token_layout.addWidget(self.token_input)
+        
+        input_layout.addLayout(repo_layout)
+        input_layout.addLayout(output_layout)
+        input_layout.addLayout(evict_layout)
+        input_layout.addLayout(token_layout)
+        
+        self.main_layout.addLayout(input_layout)
+        
+        # File list
+        list_layout = QVBoxLayout()
+        list_header_layout = QHBoxLayout()
+        list_header_layout.addWidget(QLabel("Files to Download:"))
+        self.plan_label = QLabel("")  # Disk budget for the enabled files
+        list_header_layout.addWidget(self.plan_label, 1)
+        list_layout.addLayout(list_header_layout)
+        self.file_list_widget = QListWidget()
+        list_layout.addWidget(self.file_list_widget)
+        
+        self.main_layout.addLayout(list_layout)
+        
+        # Speed control
+        speed_layout = QHBoxLayout()
+        speed_layout.addWidget(QLabel("Download Speed:"))
+        self.speed_slider = QSlider(Qt.Horizontal)
+        self.speed_slider.setMinimum(50)
+        self.speed_slider.setMaximum(10000)
+        self.speed_slider.setValue(500)
+        self.speed_slider.setTickInterval(500)
+        self.speed_slider.setTickPosition(QSlider.TicksBelow)
+        speed_layout.addWidget(self.speed_slider)
+        self.speed_label = QLabel("500 KB/s")
+        speed_layout.addWidget(self.speed_label)
+        
+        # Create a scroll area for progress bars
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setMinimumHeight(150)
+        
+        # Container widget for progress bars
+        self.progress_container = QWidget()
+        self.progress_layout = QVBoxLayout(self.progress_container)
+        self.progress_layout.setAlignment(Qt.AlignTop)
+        self.scroll_area.setWidget(self.progress_container)
+        
+        # Status section
+        self.status_layout = QHBoxLayout()
+        self.status_label = QLabel("Ready")
+        self.status_layout.addWidget(self.status_label)
+        
+        self.overall_label = QLabel("")
+        self.status_layout.addWidget(self.overall_label)
+        
+        self.start_btn = QPushButton("Start")
+        self.start_btn.setEnabled(False)
+        self.status_layout.addWidget(self.start_btn)
+        
+        self.pause_resume_btn = QPushButton("Pause")
+        self.pause_resume_btn.setEnabled(False)
+        self.status_layout.addWidget(self.pause_resume_btn)
+        
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.status_layout.addWidget(self.cancel_btn)
+        
+        # Add everything to main layout
+        self.main_layout.addLayout(speed_layout)  # Add the speed control layout
+        self.main_layout.addWidget(self.scroll_area)
+        self.main_layout.addLayout(self.status_layout)
+        
+        main_widget.setLayout(self.main_layout)
+        self.setCentralWidget(main_widget)
+    
+    def connect_signals(self):
+        self.load_files_btn.clicked.connect(self.load_files)
+        self.browse_btn.clicked.connect(self.browse_output_dir)
+        self.start_btn.clicked.connect(self.start_download)
+        self.pause_resume_btn.clicked.connect(self.toggle_pause_resume)
+        self.cancel_btn.clicked.connect(self.cancel_download)
+        self.speed_slider.valueChanged.connect(self.update_speed_limit)
+        self.output_dir_input.editingFinished.connect(self.refresh_plan)
+        self.quota_input.editingFinished.connect(self.refresh_plan)
+        
+        # Connect download state signals
+        download_state.progress_update.connect(self.update_progress)
+        download_state.download_complete.connect(self.on_file_download_complete)
+        download_state.file_list_ready.connect(self.on_file_list_ready)
+        download_state.status_update.connect(self.update_status)
+        download_state.speed_changed.connect(download_state.on_speed_changed)
+        download_state.download_started.connect(self.on_download_started)
+        download_state.aggregate_update.connect(self.update_aggregate_progress)
+        
+        # Refresh the overall rate and ETA on a timer so it also decays while paused
+        self.aggregate_timer = QTimer(self)
+        self.aggregate_timer.timeout.connect(self.emit_aggregate_progress)
+        self.aggregate_timer.start(500)
+    
+    def load_files(self):
+        repo_id = self.repo_id_input.text().strip()
+        if not repo_id:
+            QMessageBox.warning(self, "Error", "Please enter a Repository ID")
+            return
+            
+        token = self.token_input.text().strip() or None
+        
+        # Reset UI for new file list
+        self.file_list_widget.clear()
+        self.file_list = []
+        self.file_sizes = {}
+        self.start_btn.setEnabled(False)
+        
+        # Start thread to fetch files
+        threading.Thread(target=get_files_thread_func, args=(repo_id, token), daemon=True).start()
+    
+    def browse_output_dir(self):
+        dir_path = QFileDialog.getExistingDirectory(self, "Select Output Directory")
+        if dir_path:
+            self.output_dir_input.setText(dir_path)
+
+    def update_speed_limit(self, value):
+        self.speed_label.setText(f"{value} KB/s")
+        download_state.speed_changed.emit(value)
+    
+    def start_download(self):
+        if self.download_thread and self.download_thread.is_alive():
+            return
+            
+        repo_id = self.repo_id_input.text().strip()
+        output_dir = self.output_dir_input.text().strip()
+        token = self.token_input.text().strip() or None
+        
+        if not repo_id or not output_dir:
+            QMessageBox.warning(self, "Error", "Please enter Repository ID and Output Directory")
+            return
+            
+        if not os.path.isdir(output_dir):
+            try:
+                os.makedirs(output_dir, exist_ok=True)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Cannot create output directory: {str(e)}")
+                return
+        
+        # Get only enabled files
+        enabled_files = []
+        for i in range(self.file_list_widget.count()):
+            item = self.file_list_widget.item(i)
+            if item.data(Qt.UserRole + 1):  # If enabled
+                filename = item.text().split(" - ")[0]  # Get clean filename
+                enabled_files.append(filename)
+        
+        if not enabled_files:
+            QMessageBox.warning(self, "Warning", "No files are enabled for download")
+            return
+        
+        # Check the disk budget before starting, offering to evict old models if needed
+        plan = self.make_plan(enabled_files, evict=True)
+        if plan is None:
+            return
+        if (not plan.fits or plan.unknown_files) and not self.confirm_plan(plan):
+            return
+        reservation = plan.reserve()
+        
+        # Reset download state
+        download_state.should_pause = False
+        download_state.should_cancel = False
+        
+        # Update UI
+        self.progress_container.setVisible(True)
+        self.pause_resume_btn.setText("Pause")
+        self.pause_resume_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(True)
+        self.start_btn.setEnabled(False)
+        self.load_files_btn.setEnabled(False)
+        
+        # Remember the queue so a paused or interrupted download survives a restart
+        self.session = {'repo_id': repo_id, 'files': list(enabled_files), 'paused': False}
+        self.session_dir = output_dir
+        self.save_session()
+        self.settings.setValue("last_output_dir", output_dir)
+        self.settings.setValue("evict_dirs", self.evict_dirs_input.text().strip())
+        self.settings.setValue("evict_cache", self.evict_cache_checkbox.isChecked())
+        
+        # Start download thread with enabled files only
+        self.download_thread = threading.Thread(
+            target=download_thread_func, 
+            args=(repo_id, output_dir, enabled_files, token, reservation), 
+            daemon=True
+        )
+        self.download_thread.start()
+    
+    def toggle_pause_resume(self):
+        if download_state.should_pause:
+            download_state.should_pause = False
+            self.pause_resume_btn.setText("Pause")
+            self.update_status("Download resumed")
+        else:
+            # Workers checkpoint their offsets and close their connections
+            download_state.should_pause = True
+            self.pause_resume_btn.setText("Resume")
+            self.update_status("Download paused")
+        if self.session:
+            self.session['paused'] = download_state.should_pause
+            self.save_session()
+    
+    def save_session(self):
+        try:
+            save_session(self.session_dir, self.session['repo_id'], self.session['files'], self.session['paused'])
+        except OSError as e:
+            self.update_status(f"Could not save download state: {str(e)}")
+    
+    def restore_session(self):
+        output_dir = self.settings.value("last_output_dir", "")
+        session = load_session(output_dir)
+        if not session or not session.get('files'):
+            return
+        self.repo_id_input.setText(session['repo_id'])
+        self.output_dir_input.setText(output_dir)
+        self.restored_files = set(session['files'])
+        self.restored_paused = session.get('paused', False)
+        self.load_files()
+    
+    def cancel_download(self):
+        download_state.should_cancel = True
+        download_state.should_pause = False
+        # Also drops single-file requests, which no download thread is waiting on
+        cancel_scheduled()
+        if self.session:
+            clear_session(self.session_dir)
+            self.session = None
+        self.pause_resume_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(False)
+        self.update_status("Cancelling downloads...")
+    
+    def make_plan(self, filenames, evict=False):
+        """Disk plan for filenames, or None if the inputs are incomplete or invalid"""
+        repo_id = self.repo_id_input.text().strip()
+        output_dir = self.output_dir_input.text().strip()
+        if not repo_id or not output_dir:
+            return None
+        quota_text = self.quota_input.text().strip()
+        try:
+            quota = parse_size(quota_text) if quota_text else None
+        except ValueError as e:
+            self.update_status(str(e))
+            return None
+        evict_roots = [d.strip() for d in self.evict_dirs_input.text().split(os.pathsep) if d.strip()]
+        # Complete files are re-downloaded into a .partial, so they don't count as present
+        return plan_download(
+            output_dir, {f: self.file_sizes.get(f) for f in filenames}, quota=quota, count_existing=False,
+            evict_roots=evict_roots if evict else (),
+            evict_cache=evict and self.evict_cache_checkbox.isChecked(), repo_id=repo_id
+        )
+    
+    def enabled_filenames(self):
+        filenames = []
+        for i in range(self.file_list_widget.count()):
+            item = self.file_list_widget.item(i)
+            if item.data(Qt.UserRole + 1):
+                filenames.append(item.text().split(" - ")[0])
+        return filenames
+    
+    def refresh_plan(self):
+        plan = self.make_plan(self.enabled_filenames()) if self.file_list_widget.count() else None
+        if plan is None:
+            self.plan_label.setText("")
+            return
+        self.plan_label.setText(plan.summary())
+        self.plan_label.setStyleSheet("" if plan.fits and not plan.unknown_files else "color: red")
+    
+    def confirm_plan(self, plan):
+        if not plan.evictions:
+            answer = QMessageBox.question(
+                self, "Not enough disk space" if not plan.fits else "Download size unknown",
+                f"{plan.summary()}\n\nStart the download anyway?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            return answer == QMessageBox.Yes
+        
+        entries = "\n".join(f"{c.path} ({c.size / (1024 * 1024 * 1024):.1f} GB)" for c in plan.evictions)
+        answer = QMessageBox.question(
+            self, "Not enough disk space",
+            f"{plan.summary()}\n\nDelete these least recently used entries to make room?\n\n{entries}",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if answer != QMessageBox.Yes:
+            return False
+        freed, errors = apply_evictions(plan)
+        self.refresh_plan()
+        if errors:
+            details = "\n".join(f"{path}: {error}" for path, error in errors)
+            answer = QMessageBox.question(
+                self, "Not enough disk space",
+                f"Freed {format_size(freed)}, but some entries could not be deleted:\n\n{details}\n\n"
+                f"{plan.summary()}\n\nStart the download anyway?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            return answer == QMessageBox.Yes
+        return plan.fits
+    
+    def on_file_list_ready(self, file_list, sizes):
+        self.file_list = file_list
+        self.file_sizes = sizes
+        self.file_list_widget.clear()
+        
+        for filename in file_list:
+            item = QListWidgetItem(filename)
+            if filename in sizes:
+                item.setToolTip(f"{sizes[filename] / (1024 * 1024):.1f} MB")
+            item.setData(Qt.UserRole, "pending")  # Status: pending
+            item.setData(Qt.UserRole + 1, True)   # Enabled for download: True
+            self.file_list_widget.addItem(item)
+            
+            # Disable files that had already finished in a restored session
+            if self.restored_files is not None and filename not in self.restored_files:
+                self.toggle_file_download(item, False)
+        
+        if file_list:
+            self.start_btn.setEnabled(True)
+            
+            # Set up context menu for the file list
+            self.file_list_widget.setContextMenuPolicy(Qt.CustomContextMenu)
+            self.file_list_widget.customContextMenuRequested.connect(self.show_context_menu)
+            
+            if self.restored_files is not None:
+                state = "paused" if self.restored_paused else "interrupted"
+                self.update_status(f"Found {state} download of {len(self.restored_files)} files. "
+                                   f"Press Start to resume.")
+        self.restored_files = None
+        self.refresh_plan()
+    
+    def update_progress(self, filename, percent, downloaded_mb, total_mb, rate_mb):
+        # Update file list display
+        for i in range(self.file_list_widget.count()):
+            item = self.file_list_widget.item(i)
+            if item.text().startswith(filename):
+                item.setText(f"{filename} - {percent}%")
+                item.setData(Qt.UserRole, "downloading")
+                self.current_downloading_file = filename
+                break
+        
+        # Update progress bar if it exists
+        if filename in self.progress_bars:
+            self.progress_bars[filename].update_progress(percent, downloaded_mb, total_mb, rate_mb)
+    
+    def emit_aggregate_progress(self):
+        snapshot = progress_tracker.snapshot()
+        eta = snapshot.eta
+        download_state.aggregate_update.emit(snapshot.rate, snapshot.remaining, -1 if eta is None else eta)
+    
+    def update_aggregate_progress(self, rate, remaining, eta):
+        if remaining == 0 and rate < 1:
+            self.overall_label.setText("")
+            return
+        eta_text = format_duration(eta if eta >= 0 else None)
+        self.overall_label.setText(f"Total: {format_size(rate)}/s, {format_size(remaining)} remaining, ETA {eta_text}")
+    
+    def on_file_download_complete(self, filename, success):
+        # Update the item in the list
+        for i in range(self.file_list_widget.count()):
+            item = self.file_list_widget.item(i)
+            if item.text().startswith(filename):
+                if success:
+                    item.setText(f"{filename} - ✓")
+                    item.setData(Qt.UserRole, "completed")
+                    self.mark_session_file_done(filename)
+                else:
+                    item.setText(f"{filename} - ✗")
+                    item.setData(Qt.UserRole, "failed")
+                break
+        
+        # Update the progress bar
+        if filename in self.progress_bars:
+            self.progress_bars[filename].mark_complete(success)
+            
+            # Schedule removal of the progress bar after a delay
+            QTimer.singleShot(3000, lambda: self.remove_progress_bar(filename))
+        
+        # Reset current file display if needed
+        if self.current_downloading_file == filename:
+            self.current_downloading_file = None
+            
+        # Check if the download thread is done
+        if not self.download_thread or not self.download_thread.is_alive():
+            self.start_btn.setEnabled(True)
+            self.pause_resume_btn.setEnabled(False)
+            self.cancel_btn.setEnabled(False)
+            self.load_files_btn.setEnabled(True)
+    
+    def mark_session_file_done(self, filename):
+        if not self.session or filename not in self.session['files']:
+            return
+        self.session['files'].remove(filename)
+        if self.session['files']:
+            self.save_session()
+        else:
+            clear_session(self.session_dir)
+            self.session = None
+    
+    def remove_progress_bar(self, filename):
+        if filename in self.progress_bars:
+            # Remove the widget from layout and delete it
+            progress_bar = self.progress_bars[filename]
+            self.progress_layout.removeWidget(progress_bar)
+            progress_bar.deleteLater()
+            del self.progress_bars[filename]
+            
+            # Adjust window height if needed
+            if len(self.progress_bars) < 3:
+                self.resize(self.width(), 600)  # Reset to default height
+    
+    def update_status(self, message):
+        self.status_label.setText(message)
+    
+    def show_context_menu(self, position):
+        menu = QMenu()
+        
+        # Get the item under cursor
+        item = self.file_list_widget.itemAt(position)
+        if item:
+            # Get clean filename (without status indicators)
+            display_text = item.text()
+            filename = display_text.split(" - ")[0]  # Strip status indicators
+            status = item.data(Qt.UserRole)
+            is_enabled = item.data(Qt.UserRole + 1)
+            
+            # Only allow "Download this file" for pending files
+            if status == "pending":
+                download_action = menu.addAction("Download this file")
+                download_action.triggered.connect(lambda: self.download_single_file(filename))
+                
+                # Add toggle option for enabling/disabling
+                if is_enabled:
+                    disable_action = menu.addAction("Disable download")
+                    disable_action.triggered.connect(lambda: self.toggle_file_download(item, False))
+                else:
+                    enable_action = menu.addAction("Enable download")
+                    enable_action.triggered.connect(lambda: self.toggle_file_download(item, True))
+            
+        menu.exec_(self.file_list_widget.mapToGlobal(position))
+    
+    def toggle_file_download(self, item, enable):
+        display_text = item.text()
+        filename = display_text.split(" - ")[0]  # Strip status indicators
+        
+        # Update the item's enabled state
+        item.setData(Qt.UserRole + 1, enable)
+        
+        # Update the item's appearance
+        if enable:
+            item.setText(filename)
+            item.setForeground(self.palette().text()) # Use default text color for enabled
+        else:
+            item.setText(f"{filename} [DISABLED]") # Add indicator to text
+            item.setForeground(Qt.gray) # Use gray color for disabled
+            
+        # Count enabled files and update status
+        enabled_count = 0
+        for i in range(self.file_list_widget.count()):
+            if self.file_list_widget.item(i).data(Qt.UserRole + 1):
+                enabled_count += 1
+                
+        self.update_status(f"{enabled_count} of {self.file_list_widget.count()} files enabled for download")
+        self.refresh_plan()
+
+    def download_single_file(self, filename):
+        # Validate inputs
+        repo_id = self.repo_id_input.text().strip()
+        output_dir = self.output_dir_input.text().strip()
+        token = self.token_input.text().strip() or None
+        if not repo_id or not output_dir:
+            QMessageBox.warning(self, "Error", "Please enter Repository ID and Output Directory")
+            return
+        if not os.path.isdir(output_dir):
+            try:
+                os.makedirs(output_dir, exist_ok=True)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Cannot create output directory: {str(e)}")
+                return
+        if download_state.should_cancel:
+            # A finished cancel must not swallow new requests, one in progress would
+            if (self.download_thread and self.download_thread.is_alive()) or download_state.active_downloads:
+                self.update_status("Cancelling downloads, try again in a moment")
+                return
+            download_state.should_cancel = False
+        # Mark this file as downloading in the UI
+        for i in range(self.file_list_widget.count()):
+            item = self.file_list_widget.item(i)
+            # Get clean filename (without status indicators)
+            display_text = item.text()
+            current_filename = display_text.split(" - ")[0]
+            if current_filename == filename:
+                item.setText(f"{filename} - 0%")
+                item.setData(Qt.UserRole, "downloading")
+                break
+        # Emit signal to show we're starting a download
+        download_state.download_started.emit(filename)
+        # Files requested by hand are needed now, so they jump the queue
+        size = self.file_sizes.get(filename, 0)
+        progress_tracker.plan(filename, size)
+        scheduler.submit(repo_id, filename, size, priority=PRIORITY_URGENT, output_dir=output_dir, token=token)
+
+    def on_download_started(self, filename):
+        # Create a progress bar for this file if it doesn't exist yet
+        if filename not in self.progress_bars:
+            progress_bar = ProgressBarWidget(filename)
+            self.progress_layout.addWidget(progress_bar)
+            self.progress_bars[filename] = progress_bar
+            
+            # Ensure the progress bar is visible
+            self.scroll_area.ensureWidgetVisible(progress_bar)
+
+# Add the missing main() function
+def main(write_buffer=None, fsync_every=None):
+    # The writer threads start with the first download, so the pool can still be tuned here
+    if write_buffer is not None:
+        disk_writer.memory_budget = max(1, write_buffer)
+    if fsync_every is not None:
+        disk_writer.fsync_bytes = fsync_every
+    app = QApplication(sys.argv)
+    window = HuggingFaceDownloaderGUI()
+    window.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    main()
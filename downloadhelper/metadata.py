@@ -0,0 +1,148 @@
+import re
+import threading
+import time
+
+# Cache of per-repo file metadata (sizes and LFS hashes) so the scheduler,
+# progress views and planners don't hit the Hub once per lookup.
+
+class MetadataCache:
+    def __init__(self, ttl=600):
+        self.ttl = ttl  # Seconds before an entry is refetched
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, repo_id, revision=None):
+        with self._lock:
+            entry = self._entries.get((repo_id, revision))
+            if entry and time.time() - entry[0] < self.ttl:
+                return entry[1]
+            return None
+
+    def put(self, repo_id, revision, files):
+        with self._lock:
+            self._entries[(repo_id, revision)] = (time.time(), files)
+
+    def invalidate(self, repo_id=None):
+        with self._lock:
+            if repo_id is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == repo_id]:
+                    del self._entries[key]
+
+# Global metadata cache instance
+metadata_cache = MetadataCache()
+
+DEFAULT_FETCH_WORKERS = 8  # Concurrent metadata requests in fetch_many()
+
+def _lfs_sha256(sibling):
+    lfs = getattr(sibling, 'lfs', None)
+    if lfs is None:
+        return None
+    if isinstance(lfs, dict):
+        return lfs.get('sha256')
+    return getattr(lfs, 'sha256', None)
+
+def fetch_repo_metadata(repo_id, revision=None, token=None):
+    """Fetch {filename: {'size', 'sha256'}} for a repo and store it in the cache"""
+    from huggingface_hub import HfApi
+    
+    api = HfApi(token=token)
+    info = api.model_info(repo_id, revision=revision, files_metadata=True)
+    files = {}
+    for sibling in info.siblings or []:
+        files[sibling.rfilename] = {
+            'size': sibling.size or 0,
+            'sha256': _lfs_sha256(sibling)
+        }
+    metadata_cache.put(repo_id, revision, files)
+    return files
+
+def get_repo_metadata(repo_id, revision=None, token=None):
+    files = metadata_cache.get(repo_id, revision)
+    if files is None:
+        files = fetch_repo_metadata(repo_id, revision, token)
+    return files
+
+def get_file_sizes(repo_id, revision=None, token=None, fetch=True):
+    """Return {filename: size}, or an empty dict if metadata is unavailable"""
+    if fetch:
+        try:
+            files = get_repo_metadata(repo_id, revision, token)
+        except Exception:
+            return {}
+    else:
+        files = metadata_cache.get(repo_id, revision) or {}
+    return {name: info['size'] for name, info in files.items()}
+
+def get_file_hashes(repo_id, revision=None):
+    """Return {filename: sha256} of the LFS files in the cached metadata"""
+    files = metadata_cache.get(repo_id, revision) or {}
+    return {name: info['sha256'] for name, info in files.items() if info.get('sha256')}
+
+def fetch_many(repo_ids, revision=None, token=None, max_workers=DEFAULT_FETCH_WORKERS, refresh=False):
+    """Fetch metadata for many repos concurrently on a bounded pool.
+
+    Returns ({repo_id: files}, {repo_id: exception}); results land in the
+    metadata cache, and cached repos are not refetched unless refresh=True.
+    """
+    results = {}
+    errors = {}
+    missing = []
+    for repo_id in dict.fromkeys(repo_ids):
+        files = None if refresh else metadata_cache.get(repo_id, revision)
+        if files is None:
+            missing.append(repo_id)
+        else:
+            results[repo_id] = files
+    if not missing:
+        return results, errors
+    
+    from concurrent.futures import ThreadPoolExecutor
+
+    def fetch(repo_id):
+        try:
+            return repo_id, fetch_repo_metadata(repo_id, revision, token), None
+        except Exception as e:
+            return repo_id, None, e
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as pool:
+        for repo_id, files, error in pool.map(fetch, missing):
+            if error is None:
+                results[repo_id] = files
+            else:
+                errors[repo_id] = error
+    return results, errors
+
+def search_repos(author=None, search=None, token=None, limit=None):
+    """Model IDs matching an org and/or a name search on the Hub"""
+    from huggingface_hub import HfApi
+    
+    api = HfApi(token=token)
+    return [model.id for model in api.list_models(author=author, search=search, limit=limit)]
+
+def discover_part_repos(model_id, token=None):
+    """Find the sibling "partN" repos of model_id in one search.
+
+    Returns {part_number: repo_id}, or None if model_id has no part number or
+    the search failed. The search index can lag behind new repos, so an
+    empty or incomplete result is not proof that a part doesn't exist.
+    """
+    author, _, name = model_id.rpartition('/')
+    match = re.search(r'part(\d+)', name)
+    if not match:
+        return None
+    prefix = f"{author}/" if author else ""
+    pattern = re.compile(re.escape(prefix + name[:match.start()]) + r'part(\d+)' + re.escape(name[match.end():]) + '$')
+    try:
+        candidates = search_repos(author=author or None, search=name[:match.start()].rstrip('-_.') or name,
+                                  token=token)
+    except Exception:
+        return None
+    parts = {}
+    for repo_id in candidates:
+        part_match = pattern.match(repo_id)
+        if part_match:
+            parts[int(part_match.group(1))] = repo_id
+    return parts
+
@@ -0,0 +1,322 @@
+import os
+import re
+import shutil
+import threading
+from .checkpoint import PARTIAL_SUFFIX, REPO_MARKER, load_checkpoint
+from .fastpath import format_size
+
+# Disk budget planning: before a download starts, sum the planned bytes from
+# the repo metadata, compare them with the free space (minus what other running
+# downloads have reserved) and an optional per-directory quota, and pick
+# least-recently-used model directories or cache entries that could be evicted
+# to make room. Only the standard library is used here.
+
+DEFAULT_HEADROOM = 1024 * 1024 * 1024  # Keep 1 GB free for the OS and other writers
+
+_SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+def parse_size(text):
+    """Parse sizes like '500M', '50G' or '1.5T' into bytes"""
+    match = re.fullmatch(r'\s*([\d.]+)\s*([KMGT]?)(?:i?B)?\s*', text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {text}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+def _device(path):
+    # Walk up to an existing directory so planning works before the output dir exists
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path, os.stat(path).st_dev
+
+def directory_size(path):
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+def hf_cache_dir():
+    if os.environ.get("HF_HUB_CACHE"):
+        return os.environ["HF_HUB_CACHE"]
+    hf_home = os.environ.get("HF_HOME", os.path.join(os.path.expanduser("~"), ".cache", "huggingface"))
+    return os.path.join(hf_home, "hub")
+
+def hf_cache_entry(repo_id):
+    """Hub cache folder of a model repo"""
+    return os.path.join(hf_cache_dir(), f"models--{repo_id.replace('/', '--')}")
+
+class SpaceReservations:
+    """In-process ledger of bytes promised to running downloads, per filesystem"""
+
+    def __init__(self):
+        self._reserved = {}  # st_dev -> bytes
+        self._lock = threading.Lock()
+
+    def reserved(self, device):
+        with self._lock:
+            return self._reserved.get(device, 0)
+
+    def reserve(self, device, nbytes):
+        with self._lock:
+            self._reserved[device] = self._reserved.get(device, 0) + nbytes
+        return (device, nbytes)
+
+    def release(self, reservation):
+        if reservation is None:
+            return
+        device, nbytes = reservation
+        with self._lock:
+            self._reserved[device] = max(0, self._reserved.get(device, 0) - nbytes)
+
+# Global reservation ledger shared by the GUI and the CLI downloader
+space_reservations = SpaceReservations()
+
+class EvictionCandidate:
+    def __init__(self, path, size, last_used, device):
+        self.path = path
+        self.size = size
+        self.last_used = last_used
+        self.device = device
+
+    def __repr__(self):
+        return f"EvictionCandidate({self.path!r}, {format_size(self.size)})"
+
+def _candidate(path):
+    size = 0
+    last_used = os.stat(path).st_mtime
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                st = os.lstat(os.path.join(root, name))
+            except OSError:
+                continue
+            size += st.st_size
+            last_used = max(last_used, st.st_atime, st.st_mtime)
+    return EvictionCandidate(path, size, last_used, os.stat(path).st_dev)
+
+def _subdirs(path):
+    # Dot-directories are tool state (.git, .cache, .venv), never models
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return []
+    return [os.path.join(path, name) for name in names
+            if not name.startswith('.') and os.path.isdir(os.path.join(path, name))]
+
+def _repo_dirs(root):
+    """Model folders under root, looking into org folders of the save/org/model layout"""
+    for path in _subdirs(root):
+        if os.path.isfile(os.path.join(path, REPO_MARKER)):
+            yield path
+            continue
+        # An org folder is never evicted whole, only the repos in it
+        repos = [sub for sub in _subdirs(path) if os.path.isfile(os.path.join(sub, REPO_MARKER))]
+        if repos:
+            yield from repos
+        else:
+            yield path
+
+def find_eviction_candidates(roots=(), include_cache=False, protect=()):
+    """Model folders under roots and Hub cache repos, least recently used first"""
+    protect = [os.path.abspath(p) for p in protect]
+
+    def is_protected(path):
+        # Never offer a protected directory or one that contains it
+        return any(p == path or p.startswith(path + os.sep) for p in protect)
+
+    paths = []
+    for root in roots:
+        paths.extend(_repo_dirs(root))
+    if include_cache and os.path.isdir(hf_cache_dir()):
+        paths.extend(os.path.join(hf_cache_dir(), name) for name in os.listdir(hf_cache_dir())
+                     if name.startswith(("models--", "datasets--", "spaces--")))
+
+    candidates = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isdir(path) and not os.path.islink(path) and not is_protected(path):
+            candidates.append(_candidate(path))
+    candidates.sort(key=lambda c: c.last_used)
+    return candidates
+
+class DownloadPlan:
+    def __init__(self, output_dir, file_sizes, present_bytes, free_bytes, reserved_bytes,
+                 quota=None, used_bytes=0, headroom=DEFAULT_HEADROOM, device=None, quota_dir=None):
+        self.output_dir = output_dir
+        self.quota_dir = quota_dir or output_dir  # Directory the quota applies to
+        self.file_sizes = file_sizes
+        self.planned_bytes = sum(size for size in file_sizes.values() if size is not None)
+        self.unknown_files = [name for name, size in file_sizes.items() if size is None]
+        self.present_bytes = present_bytes  # Already on disk (complete files and checkpoints)
+        self.free_bytes = free_bytes
+        self.reserved_bytes = reserved_bytes  # Promised to other running downloads
+        self.quota = quota
+        self.used_bytes = used_bytes
+        self.headroom = headroom
+        self.device = device
+        self.evictions = []  # Candidates that would make the plan fit, oldest first
+
+    @property
+    def needed_bytes(self):
+        return max(0, self.planned_bytes - self.present_bytes)
+
+    @property
+    def disk_shortfall(self):
+        return max(0, self.needed_bytes - (self.free_bytes - self.reserved_bytes - self.headroom))
+
+    @property
+    def quota_shortfall(self):
+        if self.quota is None:
+            return 0
+        return max(0, self.used_bytes + self.needed_bytes - self.quota)
+
+    @property
+    def fits(self):
+        return self.disk_shortfall == 0 and self.quota_shortfall == 0
+
+    @property
+    def available_bytes(self):
+        available = self.free_bytes - self.reserved_bytes - self.headroom
+        if self.quota is not None:
+            available = min(available, self.quota - self.used_bytes)
+        return max(0, available)
+
+    def summary(self):
+        text = (f"{format_size(self.needed_bytes)} to download ({format_size(self.planned_bytes)} planned), "
+                f"{format_size(self.available_bytes)} available")
+        if self.quota is not None:
+            text += f" (quota {format_size(self.quota)}, {format_size(self.used_bytes)} used)"
+        if not self.fits:
+            short = max(self.disk_shortfall, self.quota_shortfall)
+            text += f", {format_size(short)} short"
+            if self.evictions:
+                evicted = sum(c.size for c in self.evictions)
+                text += f"; evicting {len(self.evictions)} old entries would free {format_size(evicted)}"
+        if self.unknown_files:
+            # Don't claim the download fits when part of it couldn't be sized
+            text += f", size unknown for {len(self.unknown_files)} files"
+        return text
+
+    def reserve(self):
+        """Reserve the needed bytes so concurrent plans don't count the same free space"""
+        return space_reservations.reserve(self.device, self.needed_bytes)
+
+def _recorded_etag(output_dir, name):
+    # huggingface_hub records the etag (for LFS files, the sha256) of files it
+    # downloaded into a local_dir in .cache/huggingface/download/<name>.metadata
+    path = os.path.join(output_dir, '.cache', 'huggingface', 'download', name + '.metadata')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    return lines[1].strip() if len(lines) > 1 else None
+
+def _is_present(output_dir, name, size, sha256):
+    path = os.path.join(output_dir, name)
+    if not os.path.isfile(path) or os.path.getsize(path) != size:
+        return False
+    # A same-sized file of another repo or revision is not this file; hashing
+    # multi-GB files here is too slow, so LFS files need a matching etag record
+    return sha256 is None or _recorded_etag(output_dir, name) == sha256
+
+def plan_download(output_dir, file_sizes, quota=None, headroom=DEFAULT_HEADROOM, count_existing=True,
+                  evict_roots=(), evict_cache=False, quota_dir=None, file_hashes=None, repo_id=None, protect=()):
+    """Plan downloading file_sizes ({filename: bytes, or None if unknown}) into output_dir.
+
+    The quota applies to quota_dir, by default output_dir itself; repos
+    downloaded into subdirectories of a shared save path pass the save path.
+    count_existing=False treats complete files as needing a fresh copy (the
+    GUI writes a new .partial before replacing them). With file_hashes
+    ({filename: sha256}) complete LFS files only count as present when
+    huggingface_hub recorded the same hash for them. Checkpointed partial
+    files count as present if they are resumable for repo_id. Eviction
+    never touches output_dir, repo_id's cache entry or the paths in protect,
+    e.g. the folders of other repos that are still downloading.
+    """
+    file_hashes = file_hashes or {}
+    present = 0
+    for name, size in file_sizes.items():
+        if size is None:
+            continue
+        path = os.path.join(output_dir, name)
+        if count_existing and _is_present(output_dir, name, size, file_hashes.get(name)):
+            present += size
+        elif os.path.exists(path + PARTIAL_SUFFIX):
+            checkpoint = load_checkpoint(path) or {}
+            if checkpoint.get('etag') and (repo_id is None or checkpoint.get('repo_id') == repo_id):
+                present += min(size, int(checkpoint.get('offset', 0)))
+
+    quota_dir = quota_dir or output_dir
+    existing_path, device = _device(output_dir)
+    plan = DownloadPlan(
+        output_dir, file_sizes, present,
+        free_bytes=shutil.disk_usage(existing_path).free,
+        reserved_bytes=space_reservations.reserved(device),
+        quota=quota,
+        used_bytes=directory_size(quota_dir) if quota is not None and os.path.isdir(quota_dir) else 0,
+        headroom=headroom,
+        device=device,
+        quota_dir=quota_dir
+    )
+
+    if not plan.fits and (evict_roots or evict_cache):
+        # Keep the output dir and any subfolder the planned files go into
+        protect = ([output_dir] + list(protect) +
+                   [os.path.join(output_dir, name.split('/')[0]) for name in file_sizes if '/' in name])
+        if repo_id:
+            protect.append(hf_cache_entry(repo_id))
+        plan.evictions = _choose_evictions(plan, find_eviction_candidates(evict_roots, evict_cache, protect))
+    return plan
+
+def _choose_evictions(plan, candidates):
+    # Oldest first until both the disk and the quota shortfall are covered
+    disk_short = plan.disk_shortfall
+    quota_short = plan.quota_shortfall
+    quota_dir = os.path.abspath(plan.quota_dir)
+    chosen = []
+    for candidate in candidates:
+        if disk_short <= 0 and quota_short <= 0:
+            break
+        frees_disk = candidate.device == plan.device
+        frees_quota = candidate.path.startswith(quota_dir + os.sep)
+        if (frees_disk and disk_short > 0) or (frees_quota and quota_short > 0):
+            chosen.append(candidate)
+            if frees_disk:
+                disk_short -= candidate.size
+            if frees_quota:
+                quota_short -= candidate.size
+    # All or nothing: don't delete anything if it still wouldn't fit
+    return chosen if disk_short <= 0 and quota_short <= 0 else []
+
+def apply_evictions(plan):
+    """Delete the plan's eviction candidates.
+
+    Returns (bytes freed, [(path, error)]). Files that can't be deleted
+    (permissions, open on Windows) are skipped, and only what was actually
+    removed is credited to the plan, so plan.fits stays honest.
+    """
+    freed = 0
+    errors = []
+    for candidate in plan.evictions:
+        failed = []
+        shutil.rmtree(candidate.path, onerror=lambda func, path, exc_info: failed.append((path, exc_info[1])))
+        removed = candidate.size
+        if failed:
+            errors.extend(failed)
+            if os.path.isdir(candidate.path):
+                removed -= min(removed, directory_size(candidate.path))
+        freed += removed
+        if candidate.device == plan.device:
+            plan.free_bytes += removed
+        if candidate.path.startswith(os.path.abspath(plan.quota_dir) + os.sep):
+            plan.used_bytes -= removed
+    plan.evictions = []
+    return freed, errors
@@ -0,0 +1,171 @@
+import threading
+import time
+from .fastpath import format_size
+
+# Transfer rate and ETA estimation. Rates are exponentially weighted moving
+# averages, so the displayed speed follows pauses and throttle changes within
+# a few seconds instead of averaging over the whole download.
+
+DEFAULT_HALF_LIFE = 3.0  # Seconds for an old sample to lose half its weight
+MIN_SAMPLE_INTERVAL = 0.1  # Bytes are accumulated for at least this long per sample
+IDLE_HALF_LIVES = 4  # A stream without bytes for this many half-lives reports 0
+MIN_ETA_RATE = 1024  # Bytes per second below which no ETA is shown
+
+class RateEstimator:
+    __slots__ = ('half_life', 'rate', '_pending', '_last')
+
+    def __init__(self, half_life=DEFAULT_HALF_LIFE):
+        self.half_life = half_life
+        self.rate = None  # Bytes per second, None until the first sample
+        self._pending = 0
+        self._last = None
+
+    def add(self, nbytes, now=None):
+        now = time.monotonic() if now is None else now
+        self._pending += nbytes
+        if self._last is None:
+            self._last = now
+            return
+        dt = now - self._last
+        if dt >= MIN_SAMPLE_INTERVAL:
+            self.rate = self._fold(dt)
+            self._pending = 0
+            self._last = now
+
+    def current(self, now=None):
+        """Rate including the time since the last sample, so idle streams decay to 0"""
+        if self._last is None:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        dt = now - self._last
+        if dt < MIN_SAMPLE_INTERVAL:
+            return self.rate or 0.0
+        if dt >= IDLE_HALF_LIVES * self.half_life:
+            # After a few half-lives the decayed rate is noise, report the stream as stalled
+            return 0.0
+        return self._fold(dt)
+
+    def _fold(self, dt):
+        sample = self._pending / dt
+        if self.rate is None:
+            return sample
+        alpha = 1 - 0.5 ** (dt / self.half_life)
+        return self.rate + alpha * (sample - self.rate)
+
+class ProgressSnapshot:
+    __slots__ = ('rate', 'downloaded', 'total', 'active')
+
+    def __init__(self, rate, downloaded, total, active):
+        self.rate = rate  # Bytes per second
+        self.downloaded = downloaded
+        self.total = total
+        self.active = active
+
+    @property
+    def remaining(self):
+        return max(0, self.total - self.downloaded)
+
+    @property
+    def eta(self):
+        """Seconds until done, or None if it can't be estimated (stalled or near-stalled)"""
+        if self.rate < MIN_ETA_RATE or self.total <= 0:
+            return None
+        return self.remaining / self.rate
+
+class ProgressTracker:
+    """Per-stream and aggregate progress.
+
+    Every update is O(1): running totals and the aggregate rate are
+    maintained incrementally, so hundreds of streams can report at high
+    frequency and snapshot() stays cheap.
+    """
+
+    def __init__(self, half_life=DEFAULT_HALF_LIFE):
+        self.half_life = half_life
+        self._streams = {}  # key -> [estimator, downloaded, size]
+        self._planned = {}  # key -> expected size for files not started yet
+        self._downloaded = 0
+        self._total = 0
+        self._overall = RateEstimator(half_life)
+        self._lock = threading.Lock()
+
+    def plan(self, key, size):
+        """Add an expected file (size from cached metadata) to the remaining bytes"""
+        with self._lock:
+            if key in self._streams or key in self._planned:
+                return
+            self._planned[key] = size or 0
+            self._total += size or 0
+
+    def start(self, key, size=0, downloaded=0):
+        with self._lock:
+            planned = self._planned.pop(key, 0)
+            old = self._streams.pop(key, None)
+            if old is not None:
+                planned = old[2]
+                self._downloaded -= old[1]
+            # The server's content length is authoritative over cached metadata
+            size = size or planned
+            self._total += size - planned
+            self._downloaded += downloaded
+            self._streams[key] = [RateEstimator(self.half_life), downloaded, size]
+
+    def update(self, key, downloaded, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                return
+            delta = downloaded - stream[1]
+            stream[1] = downloaded
+            stream[0].add(delta, now)
+            self._downloaded += delta
+            self._overall.add(delta, now)
+
+    def finish(self, key, success=True):
+        """Stop tracking a stream; failed streams no longer count towards the total"""
+        with self._lock:
+            stream = self._streams.pop(key, None)
+            if stream is None:
+                size = self._planned.pop(key, None)
+                if size is not None and not success:
+                    self._total -= size
+                return
+            if not success:
+                self._total -= stream[2]
+                self._downloaded -= stream[1]
+            elif stream[1] < stream[2]:
+                # Finished short of the expected size (e.g. stale metadata)
+                self._total -= stream[2] - stream[1]
+
+    def reset(self):
+        with self._lock:
+            self._streams.clear()
+            self._planned.clear()
+            self._downloaded = 0
+            self._total = 0
+            self._overall = RateEstimator(self.half_life)
+
+    def file_rate(self, key, now=None):
+        with self._lock:
+            stream = self._streams.get(key)
+            return stream[0].current(now) if stream else 0.0
+
+    def snapshot(self, now=None):
+        with self._lock:
+            return ProgressSnapshot(self._overall.current(now), self._downloaded, self._total,
+                                    len(self._streams))
+
+def format_duration(seconds):
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+def format_summary(snapshot):
+    return (f"{format_size(snapshot.rate)}/s, {format_size(snapshot.remaining)} remaining, "
+            f"ETA {format_duration(snapshot.eta)}")
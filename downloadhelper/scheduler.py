@@ -0,0 +1,193 @@
+import itertools
+import threading
+
+# Priority classes, lower runs first
+PRIORITY_CONFIG = 0   # Small config/tokenizer files
+PRIORITY_URGENT = 1   # Files from repos marked as "needed now"
+PRIORITY_NORMAL = 2
+
+CONFIG_EXTENSIONS = ('.json', '.txt', '.md')
+
+class DownloadJob:
+    def __init__(self, seq, repo_id, filename, size=0, priority=None, **context):
+        self.seq = seq
+        self.repo_id = repo_id
+        self.filename = filename
+        self.size = size or 0
+        self.priority = priority
+        self.context = context  # Extra arguments for the runner (output_dir, token, ...)
+        self.success = None
+        self.cancelled = False
+        self.error = None
+        self.done = threading.Event()
+
+    def __repr__(self):
+        return f"DownloadJob({self.repo_id!r}, {self.filename!r}, size={self.size})"
+
+class FifoPolicy:
+    """Run jobs in submission order"""
+    name = "fifo"
+
+    def key(self, job, scheduler):
+        return (job.seq,)
+
+class ShortestJobFirstPolicy:
+    """Run the smallest files first to minimize mean completion time"""
+    name = "sjf"
+
+    def key(self, job, scheduler):
+        return (job.size, job.seq)
+
+class PriorityPolicy:
+    """Config files first, then boosted repos, shortest first within a class"""
+    name = "priority"
+
+    def key(self, job, scheduler):
+        return (scheduler.job_priority(job), job.size, job.seq)
+
+POLICIES = {
+    FifoPolicy.name: FifoPolicy,
+    ShortestJobFirstPolicy.name: ShortestJobFirstPolicy,
+    PriorityPolicy.name: PriorityPolicy,
+}
+
+def get_policy(name):
+    try:
+        return POLICIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown scheduling policy: {name} (choose from {', '.join(POLICIES)})")
+
+class DownloadScheduler:
+    """Orders file downloads across repos and runs them on a bounded set of workers.
+
+    runner(job) is called on a worker thread and returns True on success.
+    Per-repo weights split the bandwidth limit between repos that have
+    running jobs, so one huge pull can't starve smaller ones.
+    urgent_workers extra workers only take PRIORITY_URGENT jobs, so a
+    file that is needed now starts at once even when every normal worker
+    is busy with a long download.
+    """
+
+    def __init__(self, runner, policy=None, max_workers=1, urgent_workers=0):
+        self.runner = runner
+        self.policy = policy or PriorityPolicy()
+        self.max_workers = max(1, max_workers)
+        self.urgent_workers = max(0, urgent_workers)
+        self.pending = []
+        self.running = {}  # repo_id -> number of running jobs
+        self.weights = {}  # repo_id -> bandwidth weight (default 1.0)
+        self.boosted = set()
+        self._seq = itertools.count()
+        self._threads = []
+        self._urgent_threads = []
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+
+    def set_policy(self, policy):
+        with self._lock:
+            self.policy = policy
+
+    def boost(self, repo_id, enabled=True):
+        """Mark a repo as needed now so its files jump ahead of normal work"""
+        with self._lock:
+            if enabled:
+                self.boosted.add(repo_id)
+                # Pending jobs of the repo may now be taken by an urgent worker
+                self._work_available.notify_all()
+            else:
+                self.boosted.discard(repo_id)
+
+    def set_weight(self, repo_id, weight):
+        with self._lock:
+            self.weights[repo_id] = max(0.01, float(weight))
+
+    def job_priority(self, job):
+        if job.priority is not None:
+            priority = job.priority
+        elif job.filename.endswith(CONFIG_EXTENSIONS):
+            priority = PRIORITY_CONFIG
+        else:
+            priority = PRIORITY_NORMAL
+        if job.repo_id in self.boosted:
+            priority = min(priority, PRIORITY_URGENT)
+        return priority
+
+    def submit(self, repo_id, filename, size=0, priority=None, **context):
+        with self._lock:
+            job = DownloadJob(next(self._seq), repo_id, filename, size, priority, **context)
+            self.pending.append(job)
+            self._start_workers()
+            # Urgent workers only wake up for urgent jobs, so wake everyone to let them check
+            self._work_available.notify_all()
+        return job
+
+    def cancel(self, repo_id=None):
+        """Drop pending jobs (of one repo, or all); running jobs are not interrupted"""
+        with self._lock:
+            dropped = [job for job in self.pending if repo_id is None or job.repo_id == repo_id]
+            self.pending = [job for job in self.pending if job not in dropped]
+        for job in dropped:
+            job.cancelled = True
+            job.success = False
+            job.done.set()
+        return dropped
+
+    def wait(self, jobs, timeout=None):
+        for job in jobs:
+            if not job.done.wait(timeout):
+                return False
+        return True
+
+    def rate_share(self, repo_id, total_rate):
+        """Bandwidth available to one running job of repo_id"""
+        with self._lock:
+            count = self.running.get(repo_id, 0)
+            if count == 0:
+                return total_rate
+            total_weight = sum(self.weights.get(r, 1.0) for r, n in self.running.items() if n > 0)
+            share = total_rate * self.weights.get(repo_id, 1.0) / total_weight
+            return share / count
+
+    def _start_workers(self):
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(target=self._worker_loop, name=f"scheduler-{len(self._threads)}",
+                                      daemon=True)
+            self._threads.append(thread)
+            thread.start()
+        while len(self._urgent_threads) < self.urgent_workers:
+            thread = threading.Thread(target=self._worker_loop, args=(True,),
+                                      name=f"scheduler-urgent-{len(self._urgent_threads)}", daemon=True)
+            self._urgent_threads.append(thread)
+            thread.start()
+
+    def _candidates(self, urgent_only):
+        if not urgent_only:
+            return self.pending
+        return [job for job in self.pending if self.job_priority(job) == PRIORITY_URGENT]
+
+    def _next_job(self, candidates):
+        # Keys are recomputed on every pick so boosts and policy changes apply immediately
+        job = min(candidates, key=lambda j: self.policy.key(j, self))
+        self.pending.remove(job)
+        self.running[job.repo_id] = self.running.get(job.repo_id, 0) + 1
+        return job
+
+    def _worker_loop(self, urgent_only=False):
+        while True:
+            with self._work_available:
+                candidates = self._candidates(urgent_only)
+                while not candidates:
+                    self._work_available.wait()
+                    candidates = self._candidates(urgent_only)
+                job = self._next_job(candidates)
+            try:
+                job.success = bool(self.runner(job))
+            except Exception as e:
+                job.error = e
+                job.success = False
+            finally:
+                with self._lock:
+                    self.running[job.repo_id] -= 1
+                    if self.running[job.repo_id] == 0:
+                        del self.running[job.repo_id]
+                job.done.set()
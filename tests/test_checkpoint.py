@@ -0,0 +1,38 @@
+from downloadhelper.checkpoint import (PARTIAL_SUFFIX, clear_checkpoint, load_checkpoint, range_headers,
+                                       resume_point, save_checkpoint)
+
+def make_partial(tmp_path, data, offset, etag='"abc"', repo_id="org/model"):
+    output_path = str(tmp_path / "model.bin")
+    with open(output_path + PARTIAL_SUFFIX, 'wb') as f:
+        f.write(data)
+    save_checkpoint(output_path, repo_id, offset, size=100, etag=etag)
+    return output_path
+
+def test_resume_point_trims_bytes_past_checkpoint(tmp_path):
+    output_path = make_partial(tmp_path, b"x" * 50, 30)
+    assert resume_point(output_path, "org/model") == (30, '"abc"')
+    with open(output_path + PARTIAL_SUFFIX, 'rb') as f:
+        assert f.read() == b"x" * 30
+
+def test_resume_point_never_past_partial_file(tmp_path):
+    output_path = make_partial(tmp_path, b"x" * 10, 30)
+    assert resume_point(output_path, "org/model") == (10, '"abc"')
+
+def test_resume_point_without_etag_starts_over(tmp_path):
+    output_path = make_partial(tmp_path, b"x" * 50, 30, etag=None)
+    assert resume_point(output_path, "org/model") == (0, None)
+
+def test_resume_point_of_other_repo_starts_over(tmp_path):
+    output_path = make_partial(tmp_path, b"x" * 50, 30)
+    assert resume_point(output_path, "org/other") == (0, None)
+
+def test_resume_point_without_checkpoint(tmp_path):
+    output_path = make_partial(tmp_path, b"x" * 50, 30)
+    clear_checkpoint(output_path)
+    assert load_checkpoint(output_path) is None
+    assert resume_point(output_path, "org/model") == (0, None)
+
+def test_range_headers():
+    assert range_headers(30, '"abc"') == {'Range': "bytes=30-", 'If-Range': '"abc"'}
+    assert range_headers(0, '"abc"') == {}
+    assert range_headers(30, None) == {}
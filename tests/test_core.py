@@ -0,0 +1,61 @@
+import os
+import pytest
+from downloadhelper import core
+from downloadhelper.core import HuggingfaceDownloader, download_manager
+from downloadhelper.planner import hf_cache_entry, space_reservations
+
+@pytest.fixture
+def downloader(tmp_path, monkeypatch):
+    """Downloader whose Hub access is replaced by files written locally"""
+    sizes = {"config.json": 10, "model.bin": 1000}
+    monkeypatch.setattr(core, "get_file_sizes", lambda model_id, **kwargs: dict(sizes))
+    monkeypatch.setattr(core, "get_file_hashes", lambda model_id, revision=None: {})
+    downloader = HuggingfaceDownloader(save_path=str(tmp_path / "models"), use_auth=False, progress_interval=0)
+
+    def runner(job):
+        path = os.path.join(job.context['local_dir'], job.filename)
+        with open(path, 'wb') as f:
+            f.write(b"x" * job.size)
+        return True
+    downloader.scheduler.runner = runner
+    return downloader
+
+def reserved(downloader):
+    return space_reservations.reserved(os.stat(downloader.save_path).st_dev)
+
+def test_reservation_released_before_next_part_is_planned(downloader, monkeypatch):
+    seen = []
+    monkeypatch.setattr(downloader, "queue_next_part", lambda model_id: seen.append(reserved(downloader)))
+    before = reserved(downloader)
+    assert downloader.download("org/model-part1")
+    # The finished part's bytes are on disk, its reservation must not count a second time
+    assert seen == [before]
+    assert reserved(downloader) == before
+    assert not download_manager.is_active("org/model-part1")
+
+def test_parts_and_batches_get_their_own_directories(downloader, monkeypatch):
+    monkeypatch.setattr(downloader, "queue_next_part", lambda model_id: None)
+    monkeypatch.setattr(downloader, "prefetch_metadata", lambda model_ids, revision=None: list(model_ids))
+    results = downloader.download_multiple(["orgA/m1", "orgB/m2"])
+    assert results == {"orgA/m1": True, "orgB/m2": True}
+    for model_id in results:
+        assert os.path.getsize(os.path.join(downloader.save_path, model_id, "model.bin")) == 1000
+
+def test_planning_protects_running_repos(downloader, monkeypatch):
+    calls = []
+    def plan_download(output_dir, file_sizes, **kwargs):
+        calls.append(kwargs['protect'])
+        raise RuntimeError("stop after planning")
+    monkeypatch.setattr(core, "plan_download", plan_download)
+
+    running = downloader.repo_dir("orgA/m1")
+    downloader.local_dirs["orgA/m1"] = running
+    download_manager.add_download("orgA/m1")
+    try:
+        with pytest.raises(RuntimeError):
+            downloader._submit("orgB/m2", local_dir=downloader.repo_dir("orgB/m2"))
+    finally:
+        download_manager.remove_download("orgA/m1")
+    assert running in calls[0]
+    assert hf_cache_entry("orgA/m1") in calls[0]
+    assert not download_manager.is_active("orgB/m2")
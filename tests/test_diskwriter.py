@@ -0,0 +1,100 @@
+import threading
+import pytest
+from downloadhelper.diskwriter import DiskWriteError, DiskWriterPool
+
+def test_chunks_land_at_their_offsets(tmp_path):
+    # Several writer threads may write a file's chunks in any order
+    pool = DiskWriterPool(num_threads=4, memory_budget=1024)
+    path = tmp_path / "model.bin"
+    chunks = [bytes([i]) * (i + 1) for i in range(200)]
+    with pool.open(str(path)) as f:
+        for chunk in chunks:
+            f.write(chunk)
+    assert path.read_bytes() == b"".join(chunks)
+    assert pool.buffered_bytes == 0
+
+def test_append_continues_after_existing_bytes(tmp_path):
+    path = tmp_path / "model.bin.partial"
+    path.write_bytes(b"abc")
+    pool = DiskWriterPool(num_threads=2)
+    with pool.open(str(path), 'ab') as f:
+        f.write(b"def")
+        f.write(b"ghi")
+    assert path.read_bytes() == b"abcdefghi"
+
+def test_write_blocks_at_memory_budget(tmp_path):
+    pool = DiskWriterPool(num_threads=1, memory_budget=10)
+    handle = pool.open(str(tmp_path / "model.bin"))
+    release = threading.Event()
+    write_chunk = handle._write_chunk
+
+    def slow_write_chunk(offset, data):
+        release.wait(5)
+        write_chunk(offset, data)
+    handle._write_chunk = slow_write_chunk
+
+    handle.write(b"x" * 10)
+    second = threading.Thread(target=handle.write, args=(b"y" * 10,))
+    second.start()
+    second.join(0.2)
+    assert second.is_alive()  # Blocked until the disk catches up
+    assert pool.buffered_bytes == 10
+
+    release.set()
+    second.join(5)
+    assert not second.is_alive()
+    handle.close()
+    assert (tmp_path / "model.bin").read_bytes() == b"x" * 10 + b"y" * 10
+
+def test_write_errors_surface_on_flush_and_close(tmp_path):
+    pool = DiskWriterPool(num_threads=1)
+    handle = pool.open(str(tmp_path / "model.bin"))
+    handle._file.close()  # Every write now fails on the writer thread
+    handle.write(b"x" * 10)
+    with pytest.raises(DiskWriteError):
+        handle.flush()
+    handle.write(b"y" * 10)
+    with pytest.raises(DiskWriteError):
+        handle.close()
+    assert pool.buffered_bytes == 0
+
+    # The writer thread survived and serves other files
+    with pool.open(str(tmp_path / "other.bin")) as f:
+        f.write(b"ok")
+    assert (tmp_path / "other.bin").read_bytes() == b"ok"
+
+def test_close_discard_drops_errors(tmp_path):
+    pool = DiskWriterPool(num_threads=1)
+    handle = pool.open(str(tmp_path / "model.bin"))
+    handle._file.close()
+    handle.write(b"x")
+    handle.close(discard=True)
+
+def test_fsync_batching(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr("downloadhelper.diskwriter.os.fsync", synced.append)
+    pool = DiskWriterPool(num_threads=1, fsync_bytes=100)
+    with pool.open(str(tmp_path / "model.bin")) as f:
+        for _ in range(10):
+            f.write(b"x" * 30)
+    # Synced at 120 and 240 bytes, then the remaining 60 on close
+    assert len(synced) == 3
+
+def test_on_sync_reports_contiguous_offset(tmp_path):
+    synced = []
+    pool = DiskWriterPool(num_threads=1)
+    path = tmp_path / "model.bin.partial"
+    path.write_bytes(b"abc")
+    handle = pool.open(str(path), 'ab', on_sync=synced.append, sync_interval=0)
+    handle.write(b"def")
+    handle.flush()
+    handle.close()
+    assert synced == [6]
+
+    # A chunk landing past a gap doesn't move the synced offset until the gap is filled
+    handle = pool.open(str(path), 'ab')
+    handle._advance(9, 12)
+    assert handle._contiguous == 6
+    handle._advance(6, 9)
+    assert handle._contiguous == 12
+    handle.close()
@@ -0,0 +1,30 @@
+from downloadhelper.checkpoint import mark_repo_dir, save_checkpoint, save_session
+from downloadhelper.fastpath import format_size, main
+
+def test_status_counts_only_model_files(tmp_path, capsys):
+    (tmp_path / "model.safetensors").write_bytes(b"x" * 100)
+    # huggingface_hub's local_dir records and our own bookkeeping files
+    download_dir = tmp_path / ".cache" / "huggingface" / "download"
+    download_dir.mkdir(parents=True)
+    (download_dir / "model.safetensors.metadata").write_text("commit\netag\n0\n")
+    (download_dir / "model.safetensors.lock").write_text("")
+    (tmp_path / "config.json.partial.json.tmp").write_text("{}")
+    save_session(str(tmp_path), "org/model", ["config.json"])
+
+    assert main(["status", "--save-path", str(tmp_path)]) == 0
+    assert capsys.readouterr().out.splitlines()[0] == f"{tmp_path}: 1 files, 100 B"
+
+def test_status_lists_repo_subdirectories_and_partials(tmp_path, capsys):
+    repo = tmp_path / "org" / "model"
+    mark_repo_dir(str(repo), "org/model")
+    (repo / "weights.bin").write_bytes(b"x" * 10)
+    (repo / "big.bin.partial").write_bytes(b"y" * 40)
+    save_checkpoint(str(repo / "big.bin"), "org/model", 30, size=50, etag='"abc"')
+
+    assert main(["status", "--save-path", str(tmp_path)]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1] == "  org/model: 1 files, 10 B"
+    assert lines[2].endswith(f"(40 B of {format_size(50)}, resumable from {format_size(30)})")
+
+def test_status_missing_directory(tmp_path):
+    assert main(["status", "--save-path", str(tmp_path / "missing")]) == 1
@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+pytest.importorskip("requests")
+
+from downloadhelper import gui
+from downloadhelper.checkpoint import PARTIAL_SUFFIX, load_checkpoint, save_checkpoint
+
+class FakeResponse:
+    def __init__(self, status_code, body, etag):
+        self.status_code = status_code
+        self.body = body
+        self.headers = {'content-length': str(len(body)), 'ETag': etag}
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+class FakeHub:
+    def __init__(self):
+        self.requests = []  # Headers of each request
+        self.response = None
+
+    def get(self, url, stream=True, headers=None):
+        self.requests.append(headers or {})
+        return self.response
+
+@pytest.fixture
+def fake_hub(monkeypatch):
+    hub = FakeHub()
+    monkeypatch.setattr(gui.requests, "get", hub.get)
+    monkeypatch.setattr(gui.download_state, "should_cancel", False)
+    monkeypatch.setattr(gui.download_state, "should_pause", False)
+    monkeypatch.setattr(gui.download_state, "current_rate_limit", 1024 * 1024)
+    return hub
+
+def test_resume_sends_if_range_and_appends_on_206(tmp_path, fake_hub):
+    output_path = str(tmp_path / "model.bin")
+    with open(output_path + PARTIAL_SUFFIX, 'wb') as f:
+        f.write(b"hello ")
+    save_checkpoint(output_path, "org/model", 6, size=11, etag='"v1"')
+    fake_hub.response = FakeResponse(206, b"world", '"v1"')
+
+    assert gui.download_file_with_rate_limit("org/model", "model.bin", str(tmp_path))
+    assert fake_hub.requests == [{'Range': "bytes=6-", 'If-Range': '"v1"'}]
+    with open(output_path, 'rb') as f:
+        assert f.read() == b"hello world"
+    assert load_checkpoint(output_path) is None
+
+def test_changed_file_restarts_from_zero(tmp_path, fake_hub):
+    output_path = str(tmp_path / "model.bin")
+    with open(output_path + PARTIAL_SUFFIX, 'wb') as f:
+        f.write(b"old by")
+    save_checkpoint(output_path, "org/model", 6, size=11, etag='"v1"')
+    # The file changed on the Hub, so If-Range doesn't match and the server sends all of it
+    fake_hub.response = FakeResponse(200, b"new content", '"v2"')
+
+    assert gui.download_file_with_rate_limit("org/model", "model.bin", str(tmp_path))
+    assert fake_hub.requests[0]['If-Range'] == '"v1"'
+    with open(output_path, 'rb') as f:
+        assert f.read() == b"new content"
+
+def test_unreadable_partial_reports_failure(tmp_path, fake_hub, monkeypatch):
+    completed = []
+    gui.download_state.download_complete.connect(lambda name, ok: completed.append((name, ok)))
+
+    def broken_resume_point(output_path, repo_id):
+        raise PermissionError("locked")
+
+    monkeypatch.setattr(gui, "resume_point", broken_resume_point)
+    assert not gui.download_file_with_rate_limit("org/model", "model.bin", str(tmp_path))
+    assert completed[-1] == ("model.bin", False)
+    assert "model.bin" not in gui.download_state.active_downloads
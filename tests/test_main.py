@@ -0,0 +1,37 @@
+import pytest
+from downloadhelper import core, metadata
+from downloadhelper.__main__ import SEARCH_CONFIRM_COUNT, main
+
+@pytest.fixture
+def search(tmp_path, monkeypatch):
+    """Fake search returning `matches`; download_multiple records instead of downloading"""
+    state = {'matches': [], 'limit': None, 'downloaded': None}
+
+    def search_repos(author=None, search=None, token=None, limit=None):
+        state['limit'] = limit
+        return state['matches'][:limit]
+
+    def download_multiple(self, model_ids, **kwargs):
+        state['downloaded'] = list(model_ids)
+        return {model_id: True for model_id in model_ids}
+
+    monkeypatch.setattr(metadata, "search_repos", search_repos)
+    monkeypatch.setattr(core.HuggingfaceDownloader, "download_multiple", download_multiple)
+    state['argv'] = ["--no-auth", "--save-path", str(tmp_path), "--author", "org"]
+    return state
+
+def test_large_search_needs_yes(search, capsys):
+    search['matches'] = [f"org/m{i}" for i in range(SEARCH_CONFIRM_COUNT + 1)]
+    assert main(search['argv']) == 1
+    assert search['downloaded'] is None
+    assert "--yes" in capsys.readouterr().out
+
+    assert main(search['argv'] + ["--yes"]) == 0
+    assert search['downloaded'] == search['matches']
+
+def test_search_is_limited(search, capsys):
+    search['matches'] = [f"org/m{i}" for i in range(5)]
+    assert main(search['argv'] + ["--limit", "3"]) == 0
+    assert search['limit'] == 3
+    assert search['downloaded'] == ["org/m0", "org/m1", "org/m2"]
+    assert "--limit" in capsys.readouterr().out
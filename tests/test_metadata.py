@@ -0,0 +1,61 @@
+import threading
+import pytest
+from downloadhelper import metadata
+from downloadhelper.metadata import fetch_many, metadata_cache
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    """Replaces the Hub request with one that records calls and caches like the real one"""
+    calls = []
+    lock = threading.Lock()
+    running = [0, 0]  # Current and highest number of concurrent fetches
+    release = threading.Event()
+
+    def fetch_repo_metadata(repo_id, revision=None, token=None):
+        with lock:
+            calls.append(repo_id)
+            running[0] += 1
+            running[1] = max(running)
+        try:
+            release.wait(1)
+            if repo_id.startswith("missing/"):
+                raise KeyError(repo_id)
+            files = {"model.bin": {'size': len(repo_id), 'sha256': None}}
+            metadata_cache.put(repo_id, revision, files)
+            return files
+        finally:
+            with lock:
+                running[0] -= 1
+
+    metadata_cache.invalidate()
+    monkeypatch.setattr(metadata, "fetch_repo_metadata", fetch_repo_metadata)
+    yield calls, running, release
+    metadata_cache.invalidate()
+
+def test_fetch_many_runs_concurrently_and_collects_errors(fetcher):
+    calls, running, release = fetcher
+    threading.Timer(0.2, release.set).start()
+    results, errors = fetch_many(["org/a", "org/b", "missing/c", "org/a"], max_workers=4)
+    assert sorted(calls) == ["missing/c", "org/a", "org/b"]  # Duplicates fetched once
+    assert running[1] == 3
+    assert set(results) == {"org/a", "org/b"}
+    assert results["org/b"]["model.bin"]['size'] == len("org/b")
+    assert list(errors) == ["missing/c"] and isinstance(errors["missing/c"], KeyError)
+
+def test_fetch_many_bounds_the_pool(fetcher):
+    calls, running, release = fetcher
+    release.set()
+    results, errors = fetch_many([f"org/m{i}" for i in range(10)], max_workers=2)
+    assert len(results) == 10 and not errors
+    assert running[1] <= 2
+
+def test_fetch_many_uses_cache_unless_refreshed(fetcher):
+    calls, running, release = fetcher
+    release.set()
+    fetch_many(["org/a", "org/b"])
+    calls.clear()
+    results, errors = fetch_many(["org/a", "org/b"])
+    assert calls == [] and set(results) == {"org/a", "org/b"}
+
+    fetch_many(["org/a"], refresh=True)
+    assert calls == ["org/a"]
@@ -0,0 +1,129 @@
+import os
+import pytest
+from downloadhelper import planner
+from downloadhelper.checkpoint import mark_repo_dir
+from downloadhelper.planner import (DownloadPlan, EvictionCandidate, _choose_evictions, apply_evictions,
+                                    find_eviction_candidates, hf_cache_entry, parse_size, plan_download)
+
+def make_model(path, size, mtime, repo_id=None):
+    if repo_id:
+        mark_repo_dir(str(path), repo_id)
+    else:
+        path.mkdir(parents=True)
+    (path / "model.bin").write_bytes(b"x" * size)
+    for name in os.listdir(path):
+        os.utime(path / name, (mtime, mtime))
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+@pytest.fixture
+def hub_cache(tmp_path, monkeypatch):
+    cache = tmp_path / "hub"
+    cache.mkdir()
+    monkeypatch.setenv("HF_HUB_CACHE", str(cache))
+    return cache
+
+def names(candidates):
+    return [os.path.relpath(c.path) for c in candidates]
+
+def test_parse_size():
+    assert parse_size("500M") == 500 * 1024 ** 2
+    assert parse_size("1.5 GB") == int(1.5 * 1024 ** 3)
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+def test_candidates_are_repo_folders_oldest_first(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_model(tmp_path / "models" / "orgA" / "m1", 10, 3000, "orgA/m1")
+    make_model(tmp_path / "models" / "orgA" / "m2", 10, 1000, "orgA/m2")
+    make_model(tmp_path / "models" / "plain", 10, 2000)
+    (tmp_path / "models" / ".git").mkdir()
+
+    candidates = find_eviction_candidates(["models"])
+    # An org folder is split into its repos, dot-directories are never offered
+    assert names(candidates) == [os.path.join("models", "orgA", "m2"), os.path.join("models", "plain"),
+                                 os.path.join("models", "orgA", "m1")]
+    assert candidates[0].size > 10  # The repo marker counts too
+
+def test_protected_folders_are_skipped(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_model(tmp_path / "models" / "orgA" / "m1", 10, 1000, "orgA/m1")
+    make_model(tmp_path / "models" / "orgB" / "m2", 10, 2000, "orgB/m2")
+    candidates = find_eviction_candidates(["models"], protect=[os.path.join("models", "orgA", "m1")])
+    assert names(candidates) == [os.path.join("models", "orgB", "m2")]
+
+def test_planning_protects_active_repos_and_their_cache(tmp_path, hub_cache, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    downloading = make_model(tmp_path / "models" / "orgA" / "m1", 10, 1000, "orgA/m1")
+    old = make_model(tmp_path / "models" / "orgC" / "old", 10, 2000, "orgC/old")
+    make_model(hub_cache / "models--orgA--m1", 10, 500)
+    make_model(hub_cache / "models--orgB--m2", 10, 600)
+    stale_cache = make_model(hub_cache / "models--orgZ--stale", 10, 700)
+
+    offered = []
+    def choose(plan, candidates):
+        offered.extend(c.path for c in candidates)
+        return []
+    monkeypatch.setattr(planner, "_choose_evictions", choose)
+
+    plan_download(os.path.join("models", "orgB", "m2"), {"model.bin": 15}, quota=0, quota_dir="models",
+                  evict_roots=["models"], evict_cache=True, repo_id="orgB/m2",
+                  protect=[downloading, hf_cache_entry("orgA/m1")])
+    # Neither the other running repo, its cache entry nor the planned repo's own cache entry
+    assert offered == [stale_cache, os.path.abspath(old)]
+
+def plan_with(free, needed, quota=None, used=0, output_dir="out", device=1):
+    return DownloadPlan(output_dir, {"model.bin": needed}, 0, free_bytes=free, reserved_bytes=0,
+                        quota=quota, used_bytes=used, headroom=0, device=device)
+
+def test_choose_evictions_oldest_first_until_it_fits():
+    plan = plan_with(free=50, needed=100)
+    candidates = [EvictionCandidate(f"/old/{i}", 30, i, 1) for i in range(4)]
+    assert [c.path for c in _choose_evictions(plan, candidates)] == ["/old/0", "/old/1"]
+
+def test_choose_evictions_all_or_nothing():
+    plan = plan_with(free=50, needed=200)
+    candidates = [EvictionCandidate(f"/old/{i}", 30, i, 1) for i in range(4)]
+    assert _choose_evictions(plan, candidates) == []
+
+def test_choose_evictions_ignores_other_disks():
+    plan = plan_with(free=50, needed=100)
+    candidates = [EvictionCandidate("/other/0", 100, 0, 2), EvictionCandidate("/old/1", 60, 1, 1)]
+    assert [c.path for c in _choose_evictions(plan, candidates)] == ["/old/1"]
+
+def test_choose_evictions_for_quota_only_counts_folders_inside_it(tmp_path):
+    quota_dir = str(tmp_path / "models")
+    plan = plan_with(free=10 ** 9, needed=100, quota=150, used=100, output_dir=quota_dir)
+    outside = EvictionCandidate(str(tmp_path / "elsewhere"), 100, 0, 1)
+    inside = EvictionCandidate(os.path.join(quota_dir, "old"), 60, 1, 1)
+    assert _choose_evictions(plan, [outside, inside]) == [inside]
+
+def test_apply_evictions_credits_freed_bytes(tmp_path):
+    old = make_model(tmp_path / "models" / "old", 100, 1000)
+    plan = plan_with(free=0, needed=50, quota=200, used=150, output_dir=str(tmp_path / "models"),
+                     device=os.stat(tmp_path).st_dev)
+    plan.evictions = find_eviction_candidates([str(tmp_path / "models")])
+    freed, errors = apply_evictions(plan)
+    assert (freed, errors) == (100, [])
+    assert not os.path.exists(old)
+    assert (plan.free_bytes, plan.used_bytes, plan.evictions) == (100, 50, [])
+    assert plan.fits
+
+def test_apply_evictions_only_credits_what_was_deleted(tmp_path, monkeypatch):
+    old = tmp_path / "models" / "old"
+    make_model(old, 100, 1000)
+    (old / "locked.bin").write_bytes(b"y" * 40)
+    plan = plan_with(free=0, needed=120, output_dir=str(tmp_path / "models"), device=os.stat(tmp_path).st_dev)
+    plan.evictions = find_eviction_candidates([str(tmp_path / "models")])
+
+    unlink = os.unlink
+    def failing_unlink(path, *args, **kwargs):
+        if str(path).endswith("locked.bin"):
+            raise PermissionError("in use")
+        return unlink(path, *args, **kwargs)
+    monkeypatch.setattr(os, "unlink", failing_unlink)
+
+    freed, errors = apply_evictions(plan)
+    assert freed == 100
+    assert any(str(path).endswith("locked.bin") for path, _ in errors)
+    assert plan.free_bytes == 100 and not plan.fits
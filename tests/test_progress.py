@@ -0,0 +1,45 @@
+from downloadhelper.progress import (DEFAULT_HALF_LIFE, IDLE_HALF_LIVES, MIN_ETA_RATE, ProgressSnapshot,
+                                     ProgressTracker, RateEstimator)
+
+MB = 1024 * 1024
+
+def test_rate_follows_steady_stream():
+    estimator = RateEstimator()
+    for second in range(11):
+        estimator.add(MB if second else 0, now=float(second))
+    assert abs(estimator.current(10.0) - MB) < 1
+
+def test_idle_stream_reports_zero_rate():
+    estimator = RateEstimator()
+    estimator.add(0, now=0.0)
+    estimator.add(10 * MB, now=1.0)
+    assert estimator.current(2.0) > 0
+    assert estimator.current(1.0 + IDLE_HALF_LIVES * DEFAULT_HALF_LIFE) == 0.0
+
+def test_stalled_download_has_no_eta():
+    tracker = ProgressTracker()
+    tracker.start("model.bin", 100 * MB)
+    tracker.update("model.bin", 0, now=0.0)
+    tracker.update("model.bin", 10 * MB, now=1.0)
+    assert tracker.snapshot(now=1.05).eta is not None
+
+    # The socket stalls for ten minutes
+    snapshot = tracker.snapshot(now=601.0)
+    assert snapshot.rate == 0.0
+    assert snapshot.eta is None
+    assert snapshot.remaining == 90 * MB
+
+def test_eta_needs_a_minimum_rate():
+    assert ProgressSnapshot(MIN_ETA_RATE / 2, 0, 10 * MB, 1).eta is None
+    assert ProgressSnapshot(MB, 0, 10 * MB, 1).eta == 10
+    assert ProgressSnapshot(MB, 0, 0, 0).eta is None
+
+def test_failed_stream_leaves_the_total():
+    tracker = ProgressTracker()
+    tracker.plan("a.bin", 10)
+    tracker.plan("b.bin", 20)
+    tracker.start("a.bin")
+    tracker.update("a.bin", 5, now=0.0)
+    tracker.finish("a.bin", success=False)
+    snapshot = tracker.snapshot(now=0.0)
+    assert (snapshot.downloaded, snapshot.total) == (0, 20)
@@ -0,0 +1,111 @@
+import threading
+import pytest
+from downloadhelper.scheduler import (PRIORITY_URGENT, DownloadJob, DownloadScheduler, FifoPolicy,
+                                      ShortestJobFirstPolicy, get_policy)
+
+def run_in_order(policy, jobs, boosted=()):
+    """Submit jobs to a single worker that is held back until all are queued"""
+    order = []
+    started = threading.Event()
+    gate = threading.Event()
+
+    def runner(job):
+        started.set()
+        gate.wait(5)
+        order.append(job.filename)
+        return True
+
+    scheduler = DownloadScheduler(runner, policy=policy, max_workers=1)
+    for repo_id in boosted:
+        scheduler.boost(repo_id)
+    # The first job occupies the worker while the rest are queued
+    submitted = [scheduler.submit("blocker/repo", "blocker.bin", 0)]
+    assert started.wait(5)
+    submitted += [scheduler.submit(repo_id, filename, size) for repo_id, filename, size in jobs]
+    gate.set()
+    assert scheduler.wait(submitted, 5)
+    return order[1:]
+
+JOBS = [
+    ("org/a", "model-1.safetensors", 300),
+    ("org/b", "model.safetensors", 100),
+    ("org/a", "config.json", 2),
+    ("org/b", "tokenizer.json", 1),
+]
+
+def test_fifo_keeps_submission_order():
+    assert run_in_order(FifoPolicy(), JOBS) == [j[1] for j in JOBS]
+
+def test_sjf_runs_smallest_first():
+    assert run_in_order(ShortestJobFirstPolicy(), JOBS) == [
+        "tokenizer.json", "config.json", "model.safetensors", "model-1.safetensors"]
+
+def test_priority_runs_config_then_boosted_repos():
+    assert run_in_order(get_policy("priority"), JOBS, boosted=["org/a"]) == [
+        "tokenizer.json", "config.json", "model-1.safetensors", "model.safetensors"]
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        get_policy("random")
+
+def test_job_priority():
+    scheduler = DownloadScheduler(lambda job: True)
+    job = DownloadJob(0, "org/a", "model.bin")
+    assert scheduler.job_priority(job) > PRIORITY_URGENT
+    scheduler.boost("org/a")
+    assert scheduler.job_priority(job) == PRIORITY_URGENT
+    assert scheduler.job_priority(DownloadJob(1, "org/b", "model.bin", priority=PRIORITY_URGENT)) == PRIORITY_URGENT
+
+def test_urgent_worker_starts_urgent_job_while_others_are_busy():
+    release = threading.Event()
+    started = []
+
+    def runner(job):
+        started.append(job.filename)
+        if job.filename.startswith("big"):
+            release.wait(5)
+        return True
+
+    scheduler = DownloadScheduler(runner, max_workers=2, urgent_workers=1)
+    big = [scheduler.submit("org/a", f"big-{i}.bin", 100) for i in range(3)]
+    urgent = scheduler.submit("org/a", "wanted.bin", 1, priority=PRIORITY_URGENT)
+    assert urgent.done.wait(5)
+    assert urgent.success
+    # The third big file waits for a normal worker, not the urgent one
+    assert "big-2.bin" not in started
+    release.set()
+    assert scheduler.wait(big, 5)
+
+def test_cancel_drops_pending_jobs():
+    started = threading.Event()
+    release = threading.Event()
+
+    def runner(job):
+        started.set()
+        return release.wait(5)
+
+    scheduler = DownloadScheduler(runner, max_workers=1)
+    running = scheduler.submit("org/a", "a.bin")
+    assert started.wait(5)
+    pending = [scheduler.submit("org/a", "b.bin"), scheduler.submit("org/b", "c.bin")]
+    dropped = scheduler.cancel("org/b")
+    assert dropped == [pending[1]] and pending[1].cancelled and pending[1].done.is_set()
+    assert scheduler.cancel() == [pending[0]]
+    release.set()
+    assert running.done.wait(5) and running.success
+
+def test_runner_exception_fails_job():
+    def runner(job):
+        raise RuntimeError("boom")
+    job = DownloadScheduler(runner).submit("org/a", "a.bin")
+    assert job.done.wait(5)
+    assert job.success is False and isinstance(job.error, RuntimeError)
+
+def test_rate_share_by_weight():
+    scheduler = DownloadScheduler(lambda job: True)
+    assert scheduler.rate_share("org/a", 900) == 900  # Nothing running
+    scheduler.running = {"org/a": 2, "org/b": 1}
+    scheduler.set_weight("org/b", 2)
+    # org/a gets a third of the bandwidth, split between its two jobs
+    assert scheduler.rate_share("org/a", 900) == pytest.approx(150)
+    assert scheduler.rate_share("org/b", 900) == pytest.approx(600)